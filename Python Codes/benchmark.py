@@ -0,0 +1,376 @@
+"""
+Synthetic-data benchmarks for the Payroll Management System
+
+Generates a database of realistic employees and salary history at a
+chosen scale (always the same data for the same seed), then times the
+data paths behind the main window without a display:
+
+    python benchmark.py --employees 10000 --salaries 120000
+    python benchmark.py --employees 100000 --salaries 5000000 --repeat 20
+
+Results are written as JSON (benchmark_results.json by default) so runs can
+be compared across commits. Generated databases are kept in --data-dir and
+reused; every run works on a fresh copy, so runs that save and delete
+records start from identical data.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+import database
+import login
+import main
+import virtual_table
+from money import Money
+
+DEFAULT_EMPLOYEES = 10000
+DEFAULT_SALARIES = 120000
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 50
+
+# Rows shown on the first screen of a table
+VISIBLE_ROWS = 30
+
+# Rows written per transaction while generating data
+INSERT_CHUNK = 10000
+
+# Latest pay period of the generated history; earlier months go back from here
+LAST_PERIOD = (2024, 12)
+
+# Every generated employee can log in with this password
+PASSWORD = "54321"
+
+FIRST_NAMES = ("Aarav", "Aisha", "Alex", "Amelia", "Ananya", "Ben", "Carlos", "Chen", "Chloe",
+               "Daniel", "Deepa", "Elena", "Emma", "Farah", "Grace", "Hannah", "Ivan", "James",
+               "Kavya", "Liam", "Lucas", "Maria", "Mei", "Mohammed", "Noah", "Olivia", "Priya",
+               "Rahul", "Sara", "Sofia", "Tom", "Wei", "Yusuf", "Zara")
+LAST_NAMES = ("Ahmed", "Brown", "Chen", "Das", "Fernandez", "Garcia", "Gupta", "Ivanov", "Jones",
+              "Khan", "Kim", "Kumar", "Lee", "Lopez", "Martin", "Miller", "Nair", "Novak", "Patel",
+              "Rossi", "Sato", "Schmidt", "Shah", "Singh", "Smith", "Taylor", "Wang", "Wilson")
+GENDERS = ("Male", "Female", "Other")
+CITIES = ("Mumbai", "Pune", "Delhi", "Bengaluru", "Chennai", "London", "Austin", "Berlin")
+
+# Departments with their designations and a typical basic salary for each
+DEPARTMENTS = {
+    "IT": (("Developer", 45000), ("Senior Developer", 70000), ("QA Engineer", 40000),
+           ("Architect", 95000)),
+    "HR": (("HR Executive", 32000), ("Recruiter", 30000), ("HR Manager", 65000)),
+    "Finance": (("Accountant", 38000), ("Financial Analyst", 52000), ("Finance Manager", 80000)),
+    "Sales": (("Sales Executive", 28000), ("Account Manager", 50000), ("Sales Manager", 72000)),
+    "Operations": (("Operator", 24000), ("Supervisor", 36000), ("Operations Manager", 68000)),
+    "Marketing": (("Marketing Executive", 30000), ("Content Writer", 27000),
+                  ("Marketing Manager", 66000)),
+}
+
+
+def dataset_path(data_dir, employees, salaries, seed):
+    return os.path.join(data_dir, f"synthetic_e{employees}_s{salaries}_seed{seed}.db")
+
+
+def synthetic_employees(rng, count, password_hash):
+    """Yield employee rows in employees column order."""
+    departments = list(DEPARTMENTS)
+    for n in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        department = rng.choice(departments)
+        designation = rng.choice(DEPARTMENTS[department])[0]
+        yield (
+            f"E{n:06d}",
+            f"{first} {last}",
+            f"{first}.{last}{n}@example.com".lower(),
+            f"9{rng.randrange(10 ** 9):09d}",
+            f"{rng.randrange(1, 400)} {rng.choice(LAST_NAMES)} Road, {rng.choice(CITIES)}",
+            rng.choice(GENDERS),
+            department,
+            designation,
+            f"{rng.randrange(2005, 2024)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            password_hash,
+        )
+
+
+def synthetic_salaries(rng, employees, count):
+    """Yield ``count`` salary rows: one per employee per month, newest month first.
+
+    ``employees`` is a list of (emp_id, name, department, basic in cents).
+    """
+    year, month = LAST_PERIOD
+    written = 0
+    while written < count:
+        date = f"{year}-{month:02d}-28"
+        for emp_id, name, department, basic in employees:
+            if written == count:
+                break
+            # Month to month variation of about 2%
+            basic_cents = basic + rng.randrange(-basic // 50, basic // 50 + 1)
+            da, hra, ma = basic_cents // 10, basic_cents // 5, 200000
+            pf, insurance = basic_cents * 6 // 100, 150000
+            tax = basic_cents * rng.choice((5, 10, 15, 20)) // 100
+            net = basic_cents + da + hra + ma - pf - insurance - tax
+            yield (emp_id, name, department, Money(basic_cents), Money(da), Money(hra), Money(ma),
+                   Money(pf), Money(insurance), Money(tax), Money(net), date)
+            written += 1
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+
+def _insert_chunked(conn, query, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == INSERT_CHUNK:
+            conn.executemany(query, chunk)
+            conn.commit()
+            chunk = []
+    if chunk:
+        conn.executemany(query, chunk)
+        conn.commit()
+
+
+def generate_dataset(path, employees=DEFAULT_EMPLOYEES, salaries=DEFAULT_SALARIES, seed=DEFAULT_SEED):
+    """Create a database of synthetic employees and salaries at ``path``.
+
+    The same arguments always produce the same data. Returns the seconds
+    taken.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    partial = path + ".partial"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(partial + suffix):
+            os.remove(partial + suffix)
+
+    database.configure(db_path=partial)
+    with redirect_stdout(io.StringIO()):
+        database.initialize_db()
+
+    staff = []
+    password_hash = hashlib.sha256(PASSWORD.encode()).hexdigest()
+
+    def collect(rows):
+        for row in rows:
+            basic = dict(DEPARTMENTS[row[6]])[row[7]] * 100
+            staff.append((row[0], row[1], row[6], basic + rng.randrange(-basic // 10, basic // 10 + 1)))
+            yield row
+
+    with database.connection() as conn:
+        _insert_chunked(conn, """
+            INSERT INTO employees (emp_id, name, email, phone, address, gender, department,
+                                   designation, doj, password)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, collect(synthetic_employees(rng, employees, password_hash)))
+        _insert_chunked(conn, """
+            INSERT INTO salaries (emp_id, name, department, basic_salary, da, hra, ma, pf,
+                                  insurance, tax, net_salary, date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, synthetic_salaries(rng, staff, salaries))
+        conn.execute("ANALYZE")
+    # Closing the pool checkpoints the WAL into the database file
+    database.close_pool()
+    os.replace(partial, path)
+    return time.perf_counter() - started
+
+
+def summarize(timings):
+    """Milliseconds statistics for a list of timings in seconds."""
+    ms = sorted(t * 1000 for t in timings)
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "min_ms": round(ms[0], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def measure(func, inputs, warmup=True):
+    """Time func(item) for every item; the first call is untimed if ``warmup``."""
+    if warmup and inputs:
+        func(inputs[0])
+    timings = []
+    for item in inputs:
+        started = time.perf_counter()
+        func(item)
+        timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+def measure_import(module="main", runs=5):
+    """Median milliseconds to import a module in a fresh interpreter."""
+    code = (f"import time; started = time.perf_counter(); import {module}; "
+            f"print(time.perf_counter() - started)")
+    here = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True,
+                                text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return round(statistics.median(timings) * 1000, 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED):
+    """Time each main window data path against the configured database.
+
+    Works on whatever database.configure() points at; records are saved
+    and deleted, so use a copy. Returns {operation: statistics}.
+    """
+    rng = random.Random(seed + 1)
+    with database.connection() as conn:
+        emp_ids = [row[0] for row in conn.execute("SELECT emp_id FROM employees WHERE emp_id LIKE 'E%'")]
+        salary_ids = [row[0] for row in conn.execute("SELECT id FROM salaries")]
+    if len(emp_ids) < repeat * 2 or not salary_ids:
+        raise ValueError("The dataset is too small for this many repeats")
+    results = {}
+
+    def open_window(table, key, columns):
+        # What fetch_employees/fetch_salaries do: count, then the first screen of rows
+        window = database.TableWindow(table, key, columns=columns)
+        window.count()
+        return window.rows(0, VISIBLE_ROWS)
+
+    results["fetch_employees"] = measure(
+        lambda _: open_window("employees", "emp_id", main.EMPLOYEE_COLUMNS), range(repeat))
+    results["fetch_salaries"] = measure(
+        lambda _: open_window("salaries", "id", main.SALARY_COLUMNS), range(repeat))
+
+    # Scrolling to random positions of an already counted table
+    for name, table, key, columns in (("scroll_employees", "employees", "emp_id", main.EMPLOYEE_COLUMNS),
+                                      ("scroll_salaries", "salaries", "id", main.SALARY_COLUMNS)):
+        window = database.TableWindow(table, key, columns=columns)
+        total = window.count()
+        offsets = [rng.randrange(max(1, total - VISIBLE_ROWS)) for _ in range(repeat)]
+        results[name] = measure(lambda offset: window.rows(offset, VISIBLE_ROWS), offsets)
+
+    # Searches as typed in the employee tab: a name prefix, a department, an id
+    searches = []
+    for _ in range(repeat):
+        kind = rng.randrange(4)
+        if kind == 0:
+            searches.append((rng.choice(FIRST_NAMES)[:3], "name"))
+        elif kind == 1:
+            searches.append((rng.choice(list(DEPARTMENTS)), "department"))
+        elif kind == 2:
+            department = rng.choice(list(DEPARTMENTS))
+            searches.append((rng.choice(DEPARTMENTS[department])[0], "designation"))
+        else:
+            searches.append((rng.choice(emp_ids), "emp_id"))
+    results["search_employee"] = measure(
+        lambda search: virtual_table.ListSource(database.search_employees(*search)), searches)
+
+    def receipt(salary_id):
+        with database.connection() as conn:
+            return main.fetch_receipt_row(conn, salary_id)
+
+    receipt_ids = rng.sample(salary_ids, repeat)
+    results["generate_receipt"] = measure(receipt, receipt_ids)
+    try:
+        import receipt_pdf
+    except ImportError:
+        receipt_pdf = None
+    if receipt_pdf:
+        rows = [receipt(salary_id) for salary_id in receipt_ids[:max(1, repeat // 5)]]
+        results["receipt_pdf"] = measure(lambda row: receipt_pdf.render_receipt_pdf(row, io.BytesIO()),
+                                         rows)
+
+    logins = [("Employee", rng.choice(emp_ids), PASSWORD) for _ in range(repeat)]
+    logins[::2] = [("Admin", "admin", "12345")] * len(logins[::2])
+    with redirect_stdout(io.StringIO()):
+        results["login"] = measure(lambda account: login.authenticate(*account), logins)
+
+    # Writes last; deleted employees are not used for saves
+    shuffled = rng.sample(emp_ids, repeat * 2)
+    to_pay, to_delete = shuffled[:repeat], shuffled[repeat:]
+    components = tuple(Money.parse(amount) for amount in
+                       (40000, 4000, 8000, 2000, 2400, 1500, 2000, 48100))
+    results["save_salary"] = measure(lambda emp_id: main.insert_salary(emp_id, components, "2025-01-31"),
+                                     to_pay, warmup=False)
+    results["delete_employee"] = measure(main.delete_employee_records, to_delete, warmup=False)
+    return results
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the payroll data paths on synthetic data")
+    parser.add_argument("--employees", type=int, default=DEFAULT_EMPLOYEES)
+    parser.add_argument("--salaries", type=int, default=DEFAULT_SALARIES, help="salary records in total")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed calls per operation")
+    parser.add_argument("--data-dir", default="benchmark_data", help="where generated databases are kept")
+    parser.add_argument("--regenerate", action="store_true", help="rebuild the dataset even if cached")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    base = dataset_path(args.data_dir, args.employees, args.salaries, args.seed)
+    generate_seconds = None
+    if args.regenerate or not os.path.exists(base):
+        print(f"Generating {args.employees} employees and {args.salaries} salaries...")
+        generate_seconds = round(generate_dataset(base, args.employees, args.salaries, args.seed), 2)
+        print(f"Generated {base} in {generate_seconds} s")
+
+    work = base[:-3] + "-run.db"
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(work + suffix):
+            os.remove(work + suffix)
+    shutil.copyfile(base, work)
+    database.configure(db_path=work)
+    with redirect_stdout(io.StringIO()):
+        # Brings a dataset made by an older version up to the current schema
+        database.initialize_db()
+
+    try:
+        operations = run_benchmarks(args.repeat, args.seed)
+    finally:
+        database.close_pool()
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "dataset": {
+            "employees": args.employees,
+            "salaries": args.salaries,
+            "seed": args.seed,
+            "path": base,
+            "generate_seconds": generate_seconds,
+        },
+        "repeat": args.repeat,
+        "startup": {"import_main_ms": measure_import("main")},
+        "operations": operations,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=1)
+
+    print(f"{'operation':<18}{'median ms':>12}{'p95 ms':>12}{'max ms':>12}")
+    for name, stats in operations.items():
+        print(f"{name:<18}{stats['median_ms']:>12}{stats['p95_ms']:>12}{stats['max_ms']:>12}")
+    print(f"import main: {results['startup']['import_main_ms']} ms")
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -1,96 +1,381 @@
-import tkinter as tk
-from tkinter import ttk, StringVar
-import styles
-
-class Calculator:
-    def __init__(self, parent):
-        self.parent = parent
-        self.result_var = StringVar()
-        self.result_var.set("0")
-        self.current_expression = ""
-        
-        # Apply enhanced styles
-        styles.configure_styles(parent.master)
-        
-        self.setup_ui()
-    
-    def setup_ui(self):
-        # Create a frame to contain the calculator
-        calc_frame = ttk.Frame(self.parent, padding=20)
-        calc_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-        
-        # Display
-        display_frame = ttk.Frame(calc_frame)
-        display_frame.pack(fill=tk.X, pady=10)
-        
-        display = ttk.Entry(
-            display_frame, 
-            textvariable=self.result_var, 
-            font=('Arial', 24),
-            justify='right',
-            state='readonly'
-        )
-        display.pack(fill=tk.X, ipady=10)
-        
-        # Buttons frame
-        buttons_frame = ttk.Frame(calc_frame)
-        buttons_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Define button layout
-        buttons = [
-            ('7', 0, 0), ('8', 0, 1), ('9', 0, 2), ('/', 0, 3),
-            ('4', 1, 0), ('5', 1, 1), ('6', 1, 2), ('*', 1, 3),
-            ('1', 2, 0), ('2', 2, 1), ('3', 2, 2), ('-', 2, 3),
-            ('0', 3, 0), ('.', 3, 1), ('C', 3, 2), ('+', 3, 3),
-            ('=', 4, 0, 4)  # Span 4 columns
-        ]
-        
-        # Create buttons
-        for button_def in buttons:
-            text = button_def[0]
-            row = button_def[1]
-            col = button_def[2]
-            
-            # Check if button spans multiple columns
-            if len(button_def) > 3:
-                colspan = button_def[3]
-                ttk.Button(
-                    buttons_frame, 
-                    text=text, 
-                    command=lambda t=text: self.button_click(t),
-                    style="Accent.TButton" if text == "=" else "TButton",
-                    padding=10
-                ).grid(row=row, column=col, columnspan=colspan, sticky="nsew", padx=5, pady=5)
-            else:
-                ttk.Button(
-                    buttons_frame, 
-                    text=text, 
-                    command=lambda t=text: self.button_click(t),
-                    style="Accent.TButton" if text in "+-*/=" else "TButton",
-                    padding=10
-                ).grid(row=row, column=col, sticky="nsew", padx=5, pady=5)
-        
-        # Configure grid weights for responsive sizing
-        for i in range(5):
-            buttons_frame.rowconfigure(i, weight=1)
-        for i in range(4):
-            buttons_frame.columnconfigure(i, weight=1)
-    
-    def button_click(self, value):
-        try:
-            if value == "=":
-                # Calculate result
-                result = eval(self.current_expression) if self.current_expression else 0
-                self.result_var.set(str(result))
-                self.current_expression = str(result)
-            elif value == "C":
-                # Clear display
-                self.result_var.set("0")
-                self.current_expression = ""
-            else:
-                # Append digit or operator
-                self.current_expression += value
-                self.result_var.set(self.current_expression)
-        except Exception as e:
-            self.result_var.set("Error")
-            self.current_expression = ""
+import tkinter as tk
+from tkinter import ttk, StringVar
+from collections import namedtuple
+from decimal import Context, Decimal, DecimalException, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_UP
+import styles
+
+# Limits that keep the work per expression bounded
+MAX_KEYS = 256
+MAX_DIGITS = 28
+MAX_DEPTH = 32
+
+# Lines kept on the history tape
+TAPE_SIZE = 500
+
+# Decimal arithmetic for the calculator, exact for amounts of money
+DECIMAL = Context(prec=28, rounding=ROUND_HALF_UP, traps=[DivisionByZero, InvalidOperation, Overflow])
+
+DIGITS = "0123456789"
+OPERATORS = "+-*/"
+KEYS = DIGITS + OPERATORS + ".()"
+
+# One level of parentheses: the sum of its finished terms (None before the
+# first), the sign and running product of the term being built, the * or /
+# waiting for its right operand, a pending unary minus and the enclosing level
+Frame = namedtuple("Frame", "total sign term mulop negate outer")
+
+_EMPTY_FRAME = Frame(None, 1, None, None, False, None)
+
+
+def _fold(frame, operand):
+    """Multiply or divide the operand into the frame's current term."""
+    if frame.negate:
+        operand = DECIMAL.minus(operand)
+    if frame.mulop is None:
+        term = operand
+    elif frame.mulop == "*":
+        term = DECIMAL.multiply(frame.term, operand)
+    else:
+        term = DECIMAL.divide(frame.term, operand)
+    return frame._replace(term=term, mulop=None, negate=False)
+
+
+def _close(frame, operand):
+    """Value of a frame as if its parenthesis were closed after the operand.
+
+    A trailing operator is ignored. Returns None for an empty frame.
+    """
+    if operand is not None:
+        frame = _fold(frame, operand)
+    term = frame.term
+    if term is not None and frame.sign < 0:
+        term = DECIMAL.minus(term)
+    if frame.total is None:
+        return term
+    if term is None:
+        return frame.total
+    return DECIMAL.add(frame.total, term)
+
+
+def _describe(error):
+    if isinstance(error, ZeroDivisionError):
+        return "Cannot divide by zero"
+    return "Result is out of range"
+
+
+class Expression:
+    """An arithmetic expression evaluated as it is typed.
+
+    A shunting-yard parser that reduces as early as it can: with only two
+    precedence levels, each operator folds everything before it into the
+    running sum and product of the innermost parenthesis, so a key press
+    does a constant amount of work and the running result only combines
+    the open parentheses. Expressions are immutable, push returns a new
+    one, so undo is just going back to the previous expression.
+    """
+
+    __slots__ = ("frame", "number", "operand", "keys", "depth")
+
+    def __init__(self, frame=_EMPTY_FRAME, number="", operand=None, keys=0, depth=0):
+        self.frame = frame
+        self.number = number  # digits of the number being typed
+        self.operand = operand  # value of a just closed parenthesis or a result
+        self.keys = keys
+        self.depth = depth
+
+    @classmethod
+    def of(cls, value):
+        """An expression holding a single value, e.g. the last result."""
+        return cls(operand=value)
+
+    def current_operand(self):
+        if self.number:
+            return Decimal(self.number)
+        return self.operand
+
+    def push(self, key):
+        """Return the expression with one more key, or raise ValueError."""
+        if self.keys >= MAX_KEYS:
+            raise ValueError("Expression is too long")
+        try:
+            return self._push(key)
+        except DecimalException as e:
+            raise ValueError(_describe(e)) from None
+
+    def _push(self, key):
+        frame = self.frame
+        keys = self.keys + 1
+        if key in DIGITS:
+            if self.operand is not None:
+                raise ValueError("Enter an operator first")
+            if len(self.number.replace(".", "")) >= MAX_DIGITS:
+                raise ValueError("Number is too long")
+            return Expression(frame, self.number + key, None, keys, self.depth)
+
+        if key == ".":
+            if self.operand is not None or "." in self.number:
+                raise ValueError("Unexpected decimal point")
+            return Expression(frame, (self.number or "0") + ".", None, keys, self.depth)
+
+        if key in OPERATORS:
+            operand = self.current_operand()
+            if operand is None:
+                if key == "-" or key == "+":
+                    # A sign in front of the next operand
+                    return Expression(frame._replace(negate=frame.negate != (key == "-")), "", None,
+                                      keys, self.depth)
+                raise ValueError("Enter a number first")
+            frame = _fold(frame, operand)
+            if key in "*/":
+                frame = frame._replace(mulop=key)
+            else:
+                frame = frame._replace(total=_close(frame, None), sign=1 if key == "+" else -1, term=None)
+            return Expression(frame, "", None, keys, self.depth)
+
+        if key == "(":
+            if self.current_operand() is not None:
+                raise ValueError("Enter an operator first")
+            if self.depth >= MAX_DEPTH:
+                raise ValueError("Too many parentheses")
+            return Expression(_EMPTY_FRAME._replace(outer=frame), "", None, keys, self.depth + 1)
+
+        if key == ")":
+            operand = self.current_operand()
+            if frame.outer is None:
+                raise ValueError("No parenthesis to close")
+            if operand is None:
+                raise ValueError("Enter a number first")
+            return Expression(frame.outer, "", _close(frame, operand), keys, self.depth - 1)
+
+        raise ValueError(f"Unknown key {key!r}")
+
+    def value(self):
+        """The running result, closing any open parentheses (None if empty)."""
+        try:
+            value = self.current_operand()
+            frame = self.frame
+            while frame is not None:
+                # An empty parenthesis gives None, leaving the level around it as it is
+                value = _close(frame, value)
+                frame = frame.outer
+            return value
+        except DecimalException as e:
+            raise ValueError(_describe(e)) from None
+
+
+def format_number(value):
+    if value is None or value.is_zero():
+        return "0"
+    return format(DECIMAL.normalize(value), "f")
+
+
+class Calculator:
+    def __init__(self, parent):
+        self.parent = parent
+        self.result_var = StringVar()
+        self.result_var.set("0")
+        self.preview_var = StringVar()
+        self.current_expression = ""
+
+        # Every expression typed so far with its text, for backspace
+        self.history = [(Expression(), "")]
+        # Set after "=" so that a new number starts a new expression
+        self.evaluated = False
+        self.tape_values = []
+
+        # Apply enhanced styles
+        styles.configure_styles(parent.master)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        # Create a frame to contain the calculator
+        calc_frame = ttk.Frame(self.parent, padding=20, takefocus=True)
+        calc_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        self.calc_frame = calc_frame
+
+        # History tape
+        tape_frame = ttk.Frame(calc_frame)
+        tape_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(20, 0))
+        ttk.Label(tape_frame, text="History", font=styles.SUBHEADING_FONT).pack(anchor="w", pady=(0, 5))
+        scroll = ttk.Scrollbar(tape_frame, orient=tk.VERTICAL)
+        self.tape = tk.Listbox(tape_frame, font=styles.MONOSPACE_FONT, width=32, takefocus=False,
+                               activestyle="none", yscrollcommand=scroll.set)
+        scroll.configure(command=self.tape.yview)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tape.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Double-click a line to continue from its result
+        self.tape.bind("<Double-Button-1>", self.recall)
+
+        # Display
+        display_frame = ttk.Frame(calc_frame)
+        display_frame.pack(fill=tk.X, pady=10)
+
+        display = ttk.Entry(
+            display_frame,
+            textvariable=self.result_var,
+            font=('Arial', 24),
+            justify='right',
+            state='readonly',
+            takefocus=False
+        )
+        display.pack(fill=tk.X, ipady=10)
+
+        # Running result of the expression being typed
+        ttk.Label(display_frame, textvariable=self.preview_var, font=styles.SUBHEADING_FONT,
+                  foreground=styles.MEDIUM_GRAY, anchor="e").pack(fill=tk.X, pady=(5, 0))
+
+        # Buttons frame
+        buttons_frame = ttk.Frame(calc_frame)
+        buttons_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Define button layout
+        buttons = [
+            ('7', 0, 0), ('8', 0, 1), ('9', 0, 2), ('/', 0, 3),
+            ('4', 1, 0), ('5', 1, 1), ('6', 1, 2), ('*', 1, 3),
+            ('1', 2, 0), ('2', 2, 1), ('3', 2, 2), ('-', 2, 3),
+            ('0', 3, 0), ('.', 3, 1), ('C', 3, 2), ('+', 3, 3),
+            ('(', 4, 0), (')', 4, 1), ('⌫', 4, 2), ('=', 4, 3)
+        ]
+
+        # Create buttons
+        for text, row, col in buttons:
+            ttk.Button(
+                buttons_frame,
+                text=text,
+                command=lambda t=text: self.button_click(t),
+                style="Accent.TButton" if text in "+-*/=" else "TButton",
+                padding=10,
+                takefocus=False
+            ).grid(row=row, column=col, sticky="nsew", padx=5, pady=5)
+
+        # Configure grid weights for responsive sizing
+        for i in range(5):
+            buttons_frame.rowconfigure(i, weight=1)
+        for i in range(4):
+            buttons_frame.columnconfigure(i, weight=1)
+
+        # Keyboard input while the calculator has focus
+        for widget in (calc_frame, self.tape):
+            widget.bind("<Key>", self.key_press)
+            widget.bind("<Control-v>", self.paste)
+        calc_frame.bind("<Button-1>", lambda event: calc_frame.focus_set())
+        calc_frame.bind("<Map>", lambda event: calc_frame.focus_set())
+
+    def button_click(self, value):
+        if value == "=":
+            self.evaluate()
+        elif value == "C":
+            self.clear()
+        elif value == "⌫":
+            self.backspace()
+        else:
+            self.press(value)
+
+    def key_press(self, event):
+        if event.keysym in ("Return", "KP_Enter") or event.char == "=":
+            self.evaluate()
+        elif event.keysym == "BackSpace":
+            self.backspace()
+        elif event.keysym in ("Escape", "Delete"):
+            self.clear()
+        elif event.char and event.char in KEYS:
+            self.press(event.char)
+        else:
+            # Leave other keys (Tab, shortcuts) to the default bindings
+            return None
+        return "break"
+
+    def paste(self, event=None):
+        try:
+            text = self.parent.clipboard_get()
+        except tk.TclError:
+            return "break"
+        # Keys are fed one at a time, so pasted text gets the same limits
+        for char in text[:MAX_KEYS + 1]:
+            if char.isspace():
+                continue
+            if char not in KEYS or not self.press(char):
+                break
+        return "break"
+
+    def press(self, key):
+        """Add a key to the expression; returns False if it was rejected."""
+        if self.evaluated and (key in DIGITS or key in ".("):
+            # A number after "=" starts over instead of extending the result
+            self.history = [(Expression(), "")]
+        self.evaluated = False
+        expression, text = self.history[-1]
+        try:
+            expression = expression.push(key)
+        except ValueError as e:
+            self.parent.bell()
+            self.preview_var.set(str(e))
+            return False
+        self.history.append((expression, text + key))
+        self.show()
+        return True
+
+    def backspace(self):
+        if len(self.history) > 1:
+            self.history.pop()
+            self.evaluated = False
+            self.show()
+        else:
+            self.clear()
+
+    def clear(self):
+        # Clear display
+        self.history = [(Expression(), "")]
+        self.evaluated = False
+        self.show()
+
+    def show(self):
+        expression, text = self.history[-1]
+        self.current_expression = text
+        self.result_var.set(text or "0")
+        if not text or self.evaluated:
+            self.preview_var.set("")
+            return
+        try:
+            self.preview_var.set(f"= {format_number(expression.value())}")
+        except ValueError as e:
+            self.preview_var.set(str(e))
+
+    def evaluate(self):
+        expression, text = self.history[-1]
+        if not text or self.evaluated:
+            return
+        try:
+            value = expression.value()
+        except ValueError:
+            self.result_var.set("Error")
+            self.preview_var.set("")
+            self.history = [(Expression(), "")]
+            self.current_expression = ""
+            return
+        if value is None:
+            return
+        result = format_number(value)
+        self.add_to_tape(f"{text} = {result}", value)
+        # The result becomes the start of the next expression
+        self.history = [(Expression.of(value), result)]
+        self.evaluated = True
+        self.show()
+
+    def add_to_tape(self, line, value):
+        self.tape.insert(tk.END, line)
+        self.tape_values.append(value)
+        if len(self.tape_values) > TAPE_SIZE:
+            self.tape.delete(0)
+            del self.tape_values[0]
+        self.tape.see(tk.END)
+
+    def recall(self, event=None):
+        selection = self.tape.curselection()
+        if selection:
+            value = self.tape_values[selection[0]]
+            self.history = [(Expression.of(value), format_number(value))]
+            self.evaluated = True
+            self.show()
+        self.calc_frame.focus_set()
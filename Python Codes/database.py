@@ -1,144 +1,1038 @@
-import sqlite3
-import hashlib
-import os
-
-def initialize_db():
-    """Initialize the database and create tables if they don't exist."""
-    conn = None
-    try:
-        conn = sqlite3.connect('payroll.db')
-        cursor = conn.cursor()
-        
-        # Create employees table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS employees (
-                emp_id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                email TEXT,
-                phone TEXT,
-                address TEXT,
-                gender TEXT,
-                department TEXT,
-                designation TEXT,
-                doj TEXT,
-                password TEXT NOT NULL
-            )
-        ''')
-        
-        # Create salaries table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS salaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                emp_id TEXT NOT NULL,
-                name TEXT NOT NULL,
-                department TEXT,
-                basic_salary REAL NOT NULL,
-                da REAL NOT NULL,
-                hra REAL NOT NULL,
-                ma REAL NOT NULL,
-                pf REAL NOT NULL,
-                insurance REAL NOT NULL,
-                tax REAL NOT NULL,
-                net_salary REAL NOT NULL,
-                date TEXT NOT NULL,
-                FOREIGN KEY (emp_id) REFERENCES employees(emp_id)
-            )
-        ''')
-        
-        # Create admin table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS admins (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            )
-        ''')
-        
-        # Check if admin account exists, if not create a default one
-        cursor.execute("SELECT COUNT(*) FROM admins WHERE username = ?", ("admin",))
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            # Create default admin account only if it doesn't exist
-            admin_password = "12345"
-            hashed_admin_password = hashlib.sha256(admin_password.encode()).hexdigest()
-            cursor.execute("INSERT INTO admins (username, password) VALUES (?, ?)", 
-                          ("admin", hashed_admin_password))
-            print(f"Default admin account created: Username: admin, Password: {admin_password}")
-        
-        # Check if sample employee exists, if not create one
-        cursor.execute("SELECT COUNT(*) FROM employees WHERE emp_id = ?", ("EMP001",))
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            # Create a sample employee for testing only if it doesn't exist
-            emp_id = "EMP001"
-            name = "John Doe"
-            email = "john.doe@example.com"
-            phone = "1234567890"
-            address = "123 Main St, City"
-            gender = "Male"
-            department = "IT"
-            designation = "Developer"
-            doj = "2023-01-01"
-            emp_password = "54321"
-            
-            # Hash the employee password
-            hashed_emp_password = hashlib.sha256(emp_password.encode()).hexdigest()
-            
-            # Insert sample employee
-            cursor.execute('''
-                INSERT INTO employees (emp_id, name, email, phone, address, gender, 
-                                      department, designation, doj, password) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (emp_id, name, email, phone, address, gender, 
-                  department, designation, doj, hashed_emp_password))
-            
-            print(f"Sample employee account created: ID: {emp_id}, Password: {emp_password}")
-            
-            # Check if sample salary record exists
-            cursor.execute("SELECT COUNT(*) FROM salaries WHERE emp_id = ?", (emp_id,))
-            salary_count = cursor.fetchone()[0]
-            
-            if salary_count == 0:
-                # Create a test salary entry for the sample employee
-                cursor.execute('''
-                    INSERT INTO salaries (emp_id, name, department, basic_salary, da, hra, ma, pf, insurance, tax, net_salary, date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (emp_id, name, department, 50000, 5000, 10000, 2000, 3000, 1500, 2500, 60000, "2023-04-19"))
-        
-        conn.commit()
-        print("Database initialized successfully!")
-    except Exception as e:
-        print(f"Error initializing database: {str(e)}")
-        if conn:
-            conn.close()
-    finally:
-        if conn:
-            conn.close()
-
-def check_connection():
-    """Check if the database connection works."""
-    conn = None
-    try:
-        conn = sqlite3.connect('payroll.db')
-        cursor = conn.cursor()
-        
-        # Check admins table
-        cursor.execute("SELECT * FROM admins")
-        admins = cursor.fetchall()
-        print(f"Admins in database: {admins}")
-        
-        # Check employees table
-        cursor.execute("SELECT emp_id, name, password FROM employees")
-        employees = cursor.fetchall()
-        print(f"Employees in database: {employees}")
-        
-        cursor.execute("SELECT sqlite_version();")
-        version = cursor.fetchone()
-        conn.close()
-        return f"SQLite version: {version[0]}"
-    except Exception as e:
-        if conn:
-            conn.close()
-        return f"Error connecting to database: {str(e)}"
+import sqlite3
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from money import MINOR_UNITS, Money
+import profiling
+
+# Location of the SQLite database; override with PAYROLL_DB or configure()
+DB_PATH = os.environ.get("PAYROLL_DB", "payroll.db")
+
+# Number of persistent connections kept open by the pool
+POOL_SIZE = 4
+
+# Prepared statements cached per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Employee records kept in memory by the employee lookup cache
+EMPLOYEE_CACHE_SIZE = 1024
+
+# Open the database read-only (reporting clients); PAYROLL_DB_READONLY=1
+READ_ONLY = os.environ.get("PAYROLL_DB_READONLY", "") not in ("", "0")
+
+# Performance profile applied to every connection as it is opened.
+# Override individual settings with configure(pragmas={...}).
+PRAGMA_PROFILE = {
+    "journal_mode": "WAL",     # readers and the writer no longer block each other
+    "synchronous": "NORMAL",   # durable with WAL; no fsync on every commit
+    "cache_size": -20000,      # page cache in KiB (negative) -> ~20 MB
+    "mmap_size": 268435456,    # memory-map up to 256 MB of the file
+    "temp_store": "MEMORY",    # sorts and temp indexes stay in RAM
+    "busy_timeout": 5000,      # wait up to 5 s for a lock instead of failing
+}
+
+# Salary components are declared MONEY and stored as integer minor units;
+# connections convert them to and from Money automatically.
+sqlite3.register_adapter(Money, lambda amount: amount.cents)
+sqlite3.register_converter("MONEY", lambda value: Money(int(value)))
+
+# journal_mode is a property of the file, so read-only clients skip it
+_WRITE_ONLY_PRAGMAS = ("journal_mode",)
+
+
+def apply_pragmas(conn, pragmas, read_only=False):
+    """Apply a PRAGMA profile to an open connection."""
+    for name, value in pragmas.items():
+        if read_only and name in _WRITE_ONLY_PRAGMAS:
+            continue
+        conn.execute(f"PRAGMA {name} = {value}")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+
+
+class TimedCursor(sqlite3.Cursor):
+    """A cursor that charges its statements and row fetches to profiling (SQL time)."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started, 1)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started, 1)
+
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started, 1)
+
+    # SQLite runs most of a query while its rows are stepped through
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started)
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            return super().__next__()
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """A connection whose statements, fetches and commits count as SQL time.
+
+    Pools use it for connections opened while profiling is enabled; the
+    plain sqlite3.Connection is used otherwise, so timing costs nothing
+    when it is off.
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # sqlite3's shortcuts make a plain cursor, so route them through ours
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            profiling.add_sql_time(time.perf_counter() - started)
+
+
+class ConnectionPool:
+    """A small pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to ``size`` and handed out one caller at
+    a time, so each keeps its own warm statement cache and parsed schema
+    between operations instead of paying for them on every click.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE, cached_statements=STATEMENT_CACHE_SIZE,
+                 pragmas=None, read_only=False):
+        self.db_path = db_path
+        self.size = size
+        self.cached_statements = cached_statements
+        self.pragmas = PRAGMA_PROFILE if pragmas is None else pragmas
+        self.read_only = read_only
+        self._idle = queue.LifoQueue()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.checkouts = 0
+
+    def _connect(self):
+        # check_same_thread is off because connections move between threads;
+        # the pool guarantees only one thread uses a connection at a time.
+        if self.read_only:
+            # urllib.request is slow to import and only needed here
+            from urllib.request import pathname2url
+            target = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        else:
+            target = self.db_path
+        conn = sqlite3.connect(target,
+                               uri=self.read_only,
+                               detect_types=sqlite3.PARSE_DECLTYPES,
+                               check_same_thread=False,
+                               cached_statements=self.cached_statements,
+                               factory=TimedConnection if profiling.ENABLED else sqlite3.Connection)
+        apply_pragmas(conn, self.pragmas, self.read_only)
+        return conn
+
+    def acquire(self):
+        """Take a connection from the pool, opening one if below the limit."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._connections) < self.size:
+                    conn = self._connect()
+                    self._connections.append(conn)
+                else:
+                    conn = None
+            if conn is None:
+                conn = self._idle.get()
+        self.checkouts += 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self):
+        """Close every connection owned by the pool."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+            self._idle = queue.LifoQueue()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(db_path=None, pool_size=None, pragmas=None, read_only=None):
+    """Change the database file, pool size, PRAGMA profile or access mode.
+
+    ``pragmas`` is merged over the current profile. Existing pooled
+    connections are closed so the next operation picks up the new settings.
+    """
+    global DB_PATH, POOL_SIZE, READ_ONLY, PRAGMA_PROFILE, _pool
+    with _pool_lock:
+        if db_path is not None:
+            DB_PATH = db_path
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+        if pragmas is not None:
+            PRAGMA_PROFILE = {**PRAGMA_PROFILE, **pragmas}
+        if read_only is not None:
+            READ_ONLY = read_only
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+    # Records cached from the previous database no longer apply
+    employee_cache.invalidate()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH, POOL_SIZE,
+                                       pragmas=PRAGMA_PROFILE,
+                                       read_only=READ_ONLY)
+    return _pool
+
+
+# Depth of nested connection() blocks on each thread
+_held = threading.local()
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection for the duration of a ``with`` block."""
+    pool = get_pool()
+    conn = pool.acquire()
+    depth = getattr(_held, "depth", 0)
+    _held.depth = depth + 1
+    started = time.perf_counter()
+    try:
+        yield conn
+    finally:
+        _held.depth = depth
+        pool.release(conn)
+        # Nested blocks fall inside the outer one, so only the outermost is timed
+        if profiling.ENABLED and depth == 0:
+            profiling.add_connection_time(time.perf_counter() - started)
+
+
+def close_pool():
+    """Close all pooled connections (e.g. on application exit)."""
+    configure()
+
+
+# Primary-key lookup timed by measure_latency
+LATENCY_QUERY = "SELECT name, department FROM employees WHERE emp_id=?"
+
+
+def measure_latency(iterations=1000):
+    """Compare per-operation latency of fresh connections vs the pool.
+
+    Runs the same primary-key lookup both ways and returns the mean time
+    per operation in microseconds, so the effect of pooling can be tracked.
+    """
+    query = LATENCY_QUERY
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute(query, ("EMP001",)).fetchone()
+        conn.close()
+    fresh = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with connection() as conn:
+            conn.execute(query, ("EMP001",)).fetchone()
+    pooled = (time.perf_counter() - start) / iterations * 1e6
+
+    return {"fresh_connection_us": round(fresh, 2),
+            "pooled_connection_us": round(pooled, 2),
+            "speedup": round(fresh / pooled, 2) if pooled else None}
+
+
+# Statements shared by the modules that write salary records
+INSERT_SALARY = """
+    INSERT INTO salaries (emp_id, name, department, basic_salary, da, hra, ma, pf, insurance, tax, net_salary, date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SALARY_COUNT_QUERY = "SELECT COUNT(*) FROM salaries WHERE emp_id = ?"
+
+
+def initialize_db():
+    """Initialize the database and create tables if they don't exist."""
+    if READ_ONLY:
+        # Reporting clients never create or migrate the schema
+        return
+    try:
+        with connection() as conn:
+            cursor = conn.cursor()
+        
+            # Create employees table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS employees (
+                    emp_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT,
+                    phone TEXT,
+                    address TEXT,
+                    gender TEXT,
+                    department TEXT,
+                    designation TEXT,
+                    doj TEXT,
+                    password TEXT NOT NULL
+                )
+            ''')
+        
+            # Create salaries table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS salaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    emp_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    department TEXT,
+                    basic_salary MONEY NOT NULL,
+                    da MONEY NOT NULL,
+                    hra MONEY NOT NULL,
+                    ma MONEY NOT NULL,
+                    pf MONEY NOT NULL,
+                    insurance MONEY NOT NULL,
+                    tax MONEY NOT NULL,
+                    net_salary MONEY NOT NULL,
+                    date TEXT NOT NULL,
+                    FOREIGN KEY (emp_id) REFERENCES employees(emp_id)
+                )
+            ''')
+        
+            # Create admin table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS admins (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password TEXT NOT NULL
+                )
+            ''')
+        
+            conn.commit()
+            
+            # Bring indexes and derived structures up to the current version
+            # before any rows are written in the current format
+            migrate(conn)
+            
+            # Check if admin account exists, if not create a default one
+            cursor.execute("SELECT COUNT(*) FROM admins WHERE username = ?", ("admin",))
+            count = cursor.fetchone()[0]
+        
+            if count == 0:
+                # Create default admin account only if it doesn't exist
+                admin_password = "12345"
+                hashed_admin_password = hashlib.sha256(admin_password.encode()).hexdigest()
+                cursor.execute("INSERT INTO admins (username, password) VALUES (?, ?)", 
+                              ("admin", hashed_admin_password))
+                print(f"Default admin account created: Username: admin, Password: {admin_password}")
+        
+            # Check if sample employee exists, if not create one
+            cursor.execute("SELECT COUNT(*) FROM employees WHERE emp_id = ?", ("EMP001",))
+            count = cursor.fetchone()[0]
+        
+            if count == 0:
+                # Create a sample employee for testing only if it doesn't exist
+                emp_id = "EMP001"
+                name = "John Doe"
+                email = "john.doe@example.com"
+                phone = "1234567890"
+                address = "123 Main St, City"
+                gender = "Male"
+                department = "IT"
+                designation = "Developer"
+                doj = "2023-01-01"
+                emp_password = "54321"
+            
+                # Hash the employee password
+                hashed_emp_password = hashlib.sha256(emp_password.encode()).hexdigest()
+            
+                # Insert sample employee
+                cursor.execute('''
+                    INSERT INTO employees (emp_id, name, email, phone, address, gender, 
+                                          department, designation, doj, password) 
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (emp_id, name, email, phone, address, gender, 
+                      department, designation, doj, hashed_emp_password))
+            
+                print(f"Sample employee account created: ID: {emp_id}, Password: {emp_password}")
+            
+                # Check if sample salary record exists
+                cursor.execute(SALARY_COUNT_QUERY, (emp_id,))
+                salary_count = cursor.fetchone()[0]
+            
+                if salary_count == 0:
+                    # Create a test salary entry for the sample employee
+                    cursor.execute(INSERT_SALARY, (emp_id, name, department, Money.parse(50000), Money.parse(5000), Money.parse(10000),
+                          Money.parse(2000), Money.parse(3000), Money.parse(1500), Money.parse(2500),
+                          Money.parse(60000), "2023-04-19"))
+        
+            conn.commit()
+            print("Database initialized successfully!")
+    except Exception as e:
+        print(f"Error initializing database: {str(e)}")
+
+
+# Schema migrations. Each step upgrades the database by one version and is
+# recorded in PRAGMA user_version, so existing payroll.db files pick up new
+# indexes in place without losing data. Only append to this list.
+
+def _add_lookup_indexes(cursor):
+    """Version 1: indexes for per-employee, per-date and employee lookups."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_salaries_emp_date ON salaries(emp_id, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_salaries_date ON salaries(date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_designation ON employees(designation)")
+    # Admin login compares LOWER(username), which a plain index can't serve
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_admins_username_lower ON admins(LOWER(username))")
+
+
+def _add_self_service_covering_index(cursor):
+    """Version 2: covering index for the employee self-service salary view.
+
+    Employees only ever see their own history, so keying the whole row on
+    (emp_id, date) lets that view be answered from the index alone. It
+    replaces the narrower (emp_id, date) index, which it makes redundant.
+    """
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_salaries_emp_date_cover ON salaries(
+            emp_id, date, id, name, department, basic_salary, da, hra, ma,
+            pf, insurance, tax, net_salary)
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_salaries_emp_date")
+
+
+def _add_employee_search_index(cursor):
+    """Version 3: FTS5 index over the searchable employee columns.
+
+    The index is an external-content table on employees, kept in sync by
+    triggers, so only the token index is stored twice. Builds of SQLite
+    without FTS5 skip this step and search falls back to LIKE.
+    """
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+                emp_id, name, department, designation,
+                content='employees', content_rowid='rowid',
+                prefix='2 3', tokenize='unicode61 remove_diacritics 2')
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search unavailable, using LIKE search: {str(e)}")
+        return
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees BEGIN
+            INSERT INTO employees_fts(rowid, emp_id, name, department, designation)
+            VALUES (new.rowid, new.emp_id, new.name, new.department, new.designation);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees BEGIN
+            INSERT INTO employees_fts(employees_fts, rowid, emp_id, name, department, designation)
+            VALUES ('delete', old.rowid, old.emp_id, old.name, old.department, old.designation);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS employees_fts_update
+        AFTER UPDATE OF emp_id, name, department, designation ON employees BEGIN
+            INSERT INTO employees_fts(employees_fts, rowid, emp_id, name, department, designation)
+            VALUES ('delete', old.rowid, old.emp_id, old.name, old.department, old.designation);
+            INSERT INTO employees_fts(rowid, emp_id, name, department, designation)
+            VALUES (new.rowid, new.emp_id, new.name, new.department, new.designation);
+        END
+    """)
+    # Index the employees that already exist
+    cursor.execute("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')")
+
+
+# Salary component columns, in table order
+MONEY_COLUMNS = ("basic_salary", "da", "hra", "ma", "pf", "insurance", "tax", "net_salary")
+
+
+def _store_money_as_minor_units(cursor):
+    """Version 4: convert REAL salary components to integer minor units.
+
+    SQLite can't change a column type in place, so the table is rebuilt
+    (keeping ids and the AUTOINCREMENT counter) and its indexes recreated.
+    Databases created with MONEY columns already have nothing to convert.
+    """
+    cursor.execute("PRAGMA table_info(salaries)")
+    types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+    if all(types.get(column) == "MONEY" for column in MONEY_COLUMNS):
+        return
+
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name='salaries'")
+    sequence = cursor.fetchone()
+
+    cursor.execute('''
+        CREATE TABLE salaries_minor_units (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            emp_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            department TEXT,
+            basic_salary MONEY NOT NULL,
+            da MONEY NOT NULL,
+            hra MONEY NOT NULL,
+            ma MONEY NOT NULL,
+            pf MONEY NOT NULL,
+            insurance MONEY NOT NULL,
+            tax MONEY NOT NULL,
+            net_salary MONEY NOT NULL,
+            date TEXT NOT NULL,
+            FOREIGN KEY (emp_id) REFERENCES employees(emp_id)
+        )
+    ''')
+    converted = ", ".join(f"CAST(ROUND({column} * {MINOR_UNITS}) AS INTEGER)" for column in MONEY_COLUMNS)
+    cursor.execute(f"""
+        INSERT INTO salaries_minor_units
+        SELECT id, emp_id, name, department, {converted}, date FROM salaries
+    """)
+    cursor.execute("DROP TABLE salaries")
+    cursor.execute("ALTER TABLE salaries_minor_units RENAME TO salaries")
+    if sequence:
+        cursor.execute("UPDATE sqlite_sequence SET seq=? WHERE name='salaries'", (sequence[0],))
+
+    # Dropping the old table dropped its indexes too
+    _add_lookup_indexes(cursor)
+    _add_self_service_covering_index(cursor)
+
+
+def _summary_upsert(row):
+    """SQL adding one salary row (NEW or OLD) to its department/month totals."""
+    return f"""
+        INSERT INTO payroll_summary (department, month, salary_count, {', '.join(MONEY_COLUMNS)})
+        VALUES (COALESCE({row}.department, ''), substr({row}.date, 1, 7), 1,
+                {', '.join(f'{row}.{column}' for column in MONEY_COLUMNS)})
+        ON CONFLICT(department, month) DO UPDATE SET
+            salary_count = salary_count + 1,
+            {', '.join(f'{column} = {column} + excluded.{column}' for column in MONEY_COLUMNS)};
+    """
+
+
+def _summary_remove(row):
+    """SQL taking one salary row back out of its department/month totals."""
+    return f"""
+        UPDATE payroll_summary SET
+            salary_count = salary_count - 1,
+            {', '.join(f'{column} = {column} - {row}.{column}' for column in MONEY_COLUMNS)}
+        WHERE department = COALESCE({row}.department, '') AND month = substr({row}.date, 1, 7);
+        DELETE FROM payroll_summary
+        WHERE department = COALESCE({row}.department, '') AND month = substr({row}.date, 1, 7)
+          AND salary_count = 0;
+    """
+
+
+def _add_payroll_summary(cursor):
+    """Version 5: per department and pay month totals kept current by triggers.
+
+    Each salary insert, update or delete adjusts one or two summary rows,
+    so reports read departments x months rows instead of the whole history.
+    Salaries without a department are grouped under ''.
+    """
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS payroll_summary (
+            department TEXT NOT NULL,
+            month TEXT NOT NULL,
+            salary_count INTEGER NOT NULL,
+            {', '.join(f'{column} MONEY NOT NULL' for column in MONEY_COLUMNS)},
+            PRIMARY KEY (department, month)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS payroll_summary_insert AFTER INSERT ON salaries BEGIN
+            {_summary_upsert("new")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS payroll_summary_delete AFTER DELETE ON salaries BEGIN
+            {_summary_remove("old")}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS payroll_summary_update
+        AFTER UPDATE OF department, date, {', '.join(MONEY_COLUMNS)} ON salaries BEGIN
+            {_summary_remove("old")}
+            {_summary_upsert("new")}
+        END
+    """)
+    # Summarise the salaries that already exist
+    _fill_payroll_summary(cursor)
+
+
+# Department/month totals of the whole salaries table
+SUMMARY_TOTALS_QUERY = f"""
+    SELECT COALESCE(department, ''), substr(date, 1, 7), COUNT(*),
+           {', '.join(f'SUM({column})' for column in MONEY_COLUMNS)}
+    FROM salaries
+    GROUP BY COALESCE(department, ''), substr(date, 1, 7)
+"""
+
+
+def _fill_payroll_summary(cursor):
+    cursor.execute("DELETE FROM payroll_summary")
+    cursor.execute(f"""
+        INSERT INTO payroll_summary (department, month, salary_count, {', '.join(MONEY_COLUMNS)})
+        {SUMMARY_TOTALS_QUERY}
+    """)
+
+
+def _add_salary_rules(cursor):
+    """Version 6: formula rules for allowances and deductions.
+
+    A rule gives one component (or a named parameter other rules can use)
+    a formula, for everybody or for a department and/or designation ('' is
+    any). Every change bumps salary_rules_version, so compiled rules are
+    only reloaded when something changed.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS salary_rules (
+            id INTEGER PRIMARY KEY,
+            component TEXT NOT NULL,
+            formula TEXT NOT NULL,
+            department TEXT NOT NULL DEFAULT '',
+            designation TEXT NOT NULL DEFAULT '',
+            version INTEGER NOT NULL DEFAULT 1,
+            UNIQUE (component, department, designation)
+        )
+    """)
+    cursor.execute("CREATE TABLE IF NOT EXISTS salary_rules_version (version INTEGER NOT NULL)")
+    cursor.execute("INSERT INTO salary_rules_version SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM salary_rules_version)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS salary_rules_{event.lower()} AFTER {event} ON salary_rules BEGIN
+                UPDATE salary_rules_version SET version = version + 1;
+            END
+        """)
+
+
+MIGRATIONS = [
+    _add_lookup_indexes,
+    _add_self_service_covering_index,
+    _add_employee_search_index,
+    _store_money_as_minor_units,
+    _add_payroll_summary,
+    _add_salary_rules,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn):
+    """Apply any pending migrations and return the resulting schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        cursor = conn.cursor()
+        try:
+            # Each step and its version bump commit together or not at all
+            cursor.execute("BEGIN")
+            MIGRATIONS[target - 1](cursor)
+            cursor.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Database migrated to schema version {target}")
+        version = target
+    return version
+
+
+class TableWindow:
+    """Random access by row position over a table ordered by a unique key.
+
+    The key found at every ``stride``-th position is remembered as an
+    anchor, so rows at any offset are read by seeking to the nearest anchor
+    and skipping fewer than ``stride`` rows, instead of an OFFSET scan from
+    the start. Anchors are discovered lazily as deeper rows are requested.
+    Used as the row source of the virtual employee and salary tables.
+    """
+
+    def __init__(self, table, key, where=None, params=(), columns="*", stride=1000):
+        self.table = table
+        self.key = key
+        self.columns = columns
+        self.where = where
+        self.params = tuple(params)
+        self.stride = stride
+        self._anchors = [None]  # None: the first row
+        self._count = None
+
+    def _select(self, columns, from_key):
+        clauses = [self.where] if self.where else []
+        params = list(self.params)
+        if from_key is not None:
+            clauses.append(f"{self.key} >= ?")
+            params.append(from_key)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"SELECT {columns} FROM {self.table}{where} ORDER BY {self.key} LIMIT ? OFFSET ?", params
+
+    def _count_query(self):
+        where = f" WHERE {self.where}" if self.where else ""
+        return f"SELECT COUNT(*) FROM {self.table}{where}"
+
+    def statements(self, sample_key):
+        """The SQL this window runs, as (purpose, query, params) with sample values.
+
+        ``sample_key`` stands in for an anchor key. Used by the query plan
+        checks.
+        """
+        first_page, params = self._select(self.columns, None)
+        seek, seek_params = self._select(self.columns, sample_key)
+        anchor, anchor_params = self._select(self.key, sample_key)
+        return [
+            ("count", self._count_query(), list(self.params)),
+            ("first page", first_page, params + [100, 0]),
+            ("page", seek, seek_params + [100, 0]),
+            ("anchor", anchor, anchor_params + [1, self.stride]),
+        ]
+
+    def count(self):
+        """Number of rows in the window (cached until invalidated)."""
+        if self._count is None:
+            with connection() as conn:
+                self._count = conn.execute(self._count_query(), self.params).fetchone()[0]
+        return self._count
+
+    def rows(self, offset, limit):
+        """Return up to ``limit`` rows starting at position ``offset``.
+
+        May run on a worker thread while the Tk thread invalidates the
+        window, so new anchors are found on a copy and only kept if the
+        anchors weren't reset meanwhile.
+        """
+        known = self._anchors
+        anchors = list(known)
+        with connection() as conn:
+            index = offset // self.stride
+            try:
+                while len(anchors) <= index:
+                    query, params = self._select(self.key, anchors[-1])
+                    row = conn.execute(query, params + [1, self.stride]).fetchone()
+                    if row is None:
+                        return []
+                    anchors.append(row[0])
+            finally:
+                if self._anchors is known:
+                    self._anchors = anchors
+            query, params = self._select(self.columns, anchors[index])
+            return conn.execute(query, params + [limit, offset - index * self.stride]).fetchall()
+
+    def row_inserted(self, row):
+        """Account for a row added to the window without re-counting."""
+        self._shift(row[0], 1)
+
+    def row_updated(self, row):
+        # Rows are read fresh on demand and the key is unchanged, nothing moves
+        pass
+
+    def row_deleted(self, key):
+        """Account for a row removed from the window without re-counting."""
+        self._shift(key, -1)
+
+    def _shift(self, key, delta):
+        count = self._count
+        self.invalidate(key)
+        if count is not None:
+            self._count = count + delta
+
+    def invalidate(self, from_key=None):
+        """Forget cached positions after rows were inserted or deleted.
+
+        Anchors before ``from_key`` keep their positions; without a key
+        everything is recomputed.
+        """
+        self._count = None
+        if from_key is None:
+            self._anchors = [None]
+        else:
+            keep = 1
+            while keep < len(self._anchors) and self._anchors[keep] < from_key:
+                keep += 1
+            self._anchors = self._anchors[:keep]
+
+
+# Employee columns shown in tables and held by the lookup cache (everything
+# but the password)
+EMPLOYEE_FIELDS = ("emp_id", "name", "email", "phone", "address", "gender",
+                   "department", "designation", "doj")
+
+EMPLOYEE_QUERY = f"SELECT {', '.join(EMPLOYEE_FIELDS)} FROM employees WHERE emp_id=?"
+
+# Columns that employee search can be restricted to
+SEARCH_COLUMNS = ("emp_id", "name", "department", "designation")
+
+SEARCH_INDEX_QUERY = "SELECT 1 FROM sqlite_master WHERE type='table' AND name='employees_fts'"
+
+# Ranked full-text search, with the same columns as the employee table
+SEARCH_QUERY = f"""
+    SELECT {', '.join(f'e.{field}' for field in EMPLOYEE_FIELDS)} FROM employees_fts
+    JOIN employees e ON e.rowid = employees_fts.rowid
+    WHERE employees_fts MATCH ?
+    ORDER BY employees_fts.rank
+    LIMIT ?
+"""
+
+
+def like_search_query(column=None):
+    """Substring search on one column, for SQLite builds without FTS5."""
+    if column not in SEARCH_COLUMNS:
+        column = "emp_id"
+    return f"SELECT {', '.join(EMPLOYEE_FIELDS)} FROM employees WHERE {column} LIKE ? LIMIT ?"
+
+
+def _has_search_index(conn):
+    """Return True if the FTS5 employee index exists in this database."""
+    return conn.execute(SEARCH_INDEX_QUERY).fetchone() is not None
+
+
+def build_search_query(text, column=None):
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so
+    "jo do" finds "John Doe". Returns None if the text has no searchable words.
+    """
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    expression = " ".join(f'"{term}"*' for term in terms)
+    if column in SEARCH_COLUMNS:
+        return f"{column} : ({expression})"
+    return expression
+
+
+def search_employees(text, column=None, limit=None):
+    """Search employees by prefix on one column (or all), best match first."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        if not _has_search_index(conn):
+            # Slow path for SQLite builds without FTS5
+            cursor.execute(like_search_query(column), (f"%{text}%", -1 if limit is None else limit))
+            return cursor.fetchall()
+        
+        query = build_search_query(text, column)
+        if query is None:
+            return []
+        cursor.execute(SEARCH_QUERY, (query, -1 if limit is None else limit))
+        return cursor.fetchall()
+
+
+def rebuild_search_index():
+    """Rebuild the employee search index from the employees table.
+
+    Needed after VACUUM, which may renumber the implicit rowids the
+    external-content index is keyed on.
+    """
+    with connection() as conn:
+        if _has_search_index(conn):
+            conn.execute("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')")
+            conn.commit()
+
+
+def build_summary_query(department=None, start_month=None, end_month=None):
+    """Return (sql, params) reading the summary table with these filters."""
+    clauses = []
+    params = []
+    if department is not None:
+        clauses.append("department = ?")
+        params.append(department)
+    if start_month:
+        clauses.append("month >= ?")
+        params.append(start_month)
+    if end_month:
+        clauses.append("month <= ?")
+        params.append(end_month)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"""
+        SELECT department, month, salary_count, {', '.join(MONEY_COLUMNS)}
+        FROM payroll_summary{where}
+        ORDER BY month, department
+    """, params
+
+
+def payroll_summary(department=None, start_month=None, end_month=None):
+    """Department/month payroll totals, read from the summary table.
+
+    Months are 'YYYY-MM' and the range is inclusive. Each row is
+    (department, month, salary_count, basic_salary, da, hra, ma, pf,
+    insurance, tax, net_salary) with amounts as Money.
+    """
+    query, params = build_summary_query(department, start_month, end_month)
+    with connection() as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def rebuild_payroll_summary():
+    """Recompute the payroll summary from the salaries table."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            _fill_payroll_summary(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+class EmployeeCache:
+    """Bounded LRU cache of employee records keyed by emp_id.
+
+    Lookups of unknown ids are cached too (as None), so repeated misses
+    don't hit the database either. Writers in this process keep it correct
+    by calling put() or invalidate(); changes made by other processes are
+    only seen once an entry is evicted or invalidated. Every put() and
+    invalidate() bumps a generation counter, and a miss only caches the
+    record it read if no write happened meanwhile, so a slow lookup can't
+    overwrite a fresher record with the one it read before the write.
+    """
+
+    def __init__(self, size=EMPLOYEE_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def peek(self, emp_id):
+        """Return (True, record) if emp_id is cached, else (False, None)."""
+        with self._lock:
+            if emp_id in self._entries:
+                self._entries.move_to_end(emp_id)
+                self.hits += 1
+                return True, self._entries[emp_id]
+            return False, None
+
+    def get(self, emp_id):
+        """Return the employee record for emp_id (or None), loading it on a miss."""
+        found, record = self.peek(emp_id)
+        if found:
+            return record
+        with self._lock:
+            generation = self._generation
+        with connection() as conn:
+            record = conn.execute(EMPLOYEE_QUERY, (emp_id,)).fetchone()
+        with self._lock:
+            self.misses += 1
+            # A put() or invalidate() since the read may have newer data
+            if self._generation == generation:
+                self._store(emp_id, record)
+        return record
+
+    def put(self, emp_id, record):
+        """Store a record fresh from the database (write-through)."""
+        with self._lock:
+            self._generation += 1
+            self._store(emp_id, record)
+
+    def _store(self, emp_id, record):
+        self._entries[emp_id] = record
+        self._entries.move_to_end(emp_id)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, emp_id=None):
+        """Drop one employee, or everything when no emp_id is given."""
+        with self._lock:
+            self._generation += 1
+            if emp_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(emp_id, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+employee_cache = EmployeeCache()
+
+
+def get_employee(emp_id):
+    """An employee record (EMPLOYEE_FIELDS, no password) or None, via the cache."""
+    return employee_cache.get(emp_id)
+
+
+def check_connection():
+    """Check if the database connection works."""
+    try:
+        with connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check admins table
+            cursor.execute("SELECT * FROM admins")
+            admins = cursor.fetchall()
+            print(f"Admins in database: {admins}")
+            
+            # Check employees table
+            cursor.execute("SELECT emp_id, name, password FROM employees")
+            employees = cursor.fetchall()
+            print(f"Employees in database: {employees}")
+            
+            cursor.execute("SELECT sqlite_version();")
+            version = cursor.fetchone()
+        return f"SQLite version: {version[0]}"
+    except Exception as e:
+        return f"Error connecting to database: {str(e)}"
@@ -0,0 +1,161 @@
+"""
+Salary history export for the Payroll Management System
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import sys
+import time
+import database
+import validation
+from money import Money
+
+# Rows fetched from the database at a time
+BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = ("salary_id", "emp_id", "name", "department", "designation", "basic_salary",
+                  "da", "hra", "ma", "pf", "insurance", "tax", "net_salary", "date")
+
+EXPORT_QUERY = """
+    SELECT s.id, s.emp_id, s.name, s.department, e.designation, s.basic_salary,
+           s.da, s.hra, s.ma, s.pf, s.insurance, s.tax, s.net_salary, s.date
+    FROM salaries s
+    LEFT JOIN employees e ON e.emp_id = s.emp_id
+"""
+
+FORMATS = ("csv", "jsonl")
+
+
+def build_query(emp_id=None, department=None, start=None, end=None, period=None):
+    """Return the export query and its parameters for the given filters.
+
+    ``start`` and ``end`` are inclusive YYYY-MM-DD dates; ``period`` is a
+    'YYYY-MM' pay period and narrows the range further.
+    """
+    clauses = []
+    params = []
+    if emp_id:
+        clauses.append("s.emp_id = ?")
+        params.append(emp_id)
+    if department:
+        clauses.append("s.department = ?")
+        params.append(department)
+    if start:
+        clauses.append("s.date >= ?")
+        params.append(start)
+    if end:
+        clauses.append("s.date <= ?")
+        params.append(end)
+    if period:
+        first_day, next_start, last_day = validation.period_bounds(period)
+        clauses.append("s.date >= ? AND s.date < ?")
+        params.extend([first_day, next_start])
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return EXPORT_QUERY + where + " ORDER BY s.id", params
+
+
+def iter_salaries(batch_size=BATCH_SIZE, **filters):
+    """Yield export rows one at a time, fetching ``batch_size`` at once."""
+    query, params = build_query(**filters)
+    with database.connection() as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+
+def _open_output(path, compress):
+    if path == "-":
+        return sys.stdout, False
+    if compress:
+        return gzip.open(path, "wt", newline="", encoding="utf-8"), True
+    return open(path, "w", newline="", encoding="utf-8"), True
+
+
+def export_salaries(path, fmt=None, compress=None, batch_size=BATCH_SIZE, progress=None, **filters):
+    """Write salary history to ``path`` ("-" for stdout) as CSV or JSONL.
+
+    The format and gzip compression are taken from the extension (e.g.
+    .csv, .jsonl.gz) unless given. Rows are streamed from a fetchmany
+    cursor and written as they arrive, so memory use is the same for any
+    table size. Amounts are written as exact decimal strings. Filters are
+    those of build_query. Returns row count, seconds and rows per second.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    if compress is None:
+        compress = path.endswith(".gz")
+    if fmt is None:
+        fmt = "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+    if fmt not in FORMATS:
+        raise ValueError(f"Export format should be one of {', '.join(FORMATS)}")
+
+    started = time.perf_counter()
+    count = 0
+    file, close = _open_output(path, compress)
+    try:
+        if fmt == "csv":
+            writer = csv.writer(file)
+            writer.writerow(EXPORT_COLUMNS)
+        for row in iter_salaries(batch_size, **filters):
+            # Money values become strings like "1234.50", never floats
+            values = [str(value) if isinstance(value, Money) else value for value in row]
+            if fmt == "csv":
+                writer.writerow(values)
+            else:
+                file.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))) + "\n")
+            count += 1
+            if progress and count % batch_size == 0:
+                progress(count)
+    finally:
+        if close:
+            file.close()
+        else:
+            file.flush()
+
+    seconds = time.perf_counter() - started
+    return {
+        "path": path,
+        "format": fmt,
+        "compressed": compress,
+        "rows": count,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(count / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def add_arguments(parser):
+    """Add the export options to an argparse parser."""
+    parser.add_argument("output", help="file to write, '-' for standard output")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--gzip", action="store_true", default=None, help="compress the output")
+    parser.add_argument("--emp-id", help="only this employee")
+    parser.add_argument("--department", help="only this department")
+    parser.add_argument("--from", dest="start", help="first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="last date, YYYY-MM-DD")
+    parser.add_argument("--period", help="pay period, YYYY-MM")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+
+def run(args):
+    """Run an export from parsed arguments and report to stderr."""
+    stats = export_salaries(args.output, fmt=args.format, compress=args.gzip,
+                            batch_size=args.batch_size, emp_id=args.emp_id,
+                            department=args.department, start=args.start, end=args.end,
+                            period=args.period)
+    print(f"Exported {stats['rows']} salary records in {stats['seconds']} s "
+          f"({stats['rows_per_second']} rows/s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export salary history")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Exact money arithmetic for the Payroll Management System
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Minor units per major unit (cents per dollar, paise per rupee)
+MINOR_UNITS = 100
+_QUANTUM = Decimal(1) / MINOR_UNITS
+
+
+class Money:
+    """An amount of money held as an integer number of minor units.
+
+    Salary components are stored in the database as integers, so sums and
+    GROUP BY aggregates are exact and never need rounding fix-ups.
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        if not isinstance(cents, int):
+            raise TypeError(f"Money needs an integer number of minor units, got {cents!r}")
+        self.cents = cents
+
+    @classmethod
+    def parse(cls, value):
+        """Build a Money value from user input or a major-unit number.
+
+        Accepts strings like "1234.5", ints, floats and Decimals; the amount
+        is rounded half-up to the nearest minor unit. Anything else, including
+        amounts too large to hold exactly, raises ValueError:
+
+        >>> Money.parse("1234.505")
+        Money('1234.51')
+        >>> Money.parse("1e26")
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid amount: '1e26'
+        """
+        if isinstance(value, Money):
+            return value
+        try:
+            amount = Decimal(str(value).strip() or "0")
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}")
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        try:
+            cents = (amount * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            # More digits than the decimal context holds
+            raise ValueError(f"Invalid amount: {value!r}")
+        return cls(int(cents))
+
+    def to_decimal(self):
+        return Decimal(self.cents) / MINOR_UNITS
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    # Lets sum() start from 0
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __mul__(self, factor):
+        """Scale by a rate such as 0.12, rounding half-up to a minor unit."""
+        if isinstance(factor, Money):
+            return NotImplemented
+        scaled = Decimal(self.cents) * Decimal(str(factor))
+        return Money(int(scaled.quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Money):
+            return self.cents <= other.cents
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Money):
+            return self.cents > other.cents
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Money):
+            return self.cents >= other.cents
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __float__(self):
+        return self.cents / MINOR_UNITS
+
+    def __str__(self):
+        return str(self.to_decimal().quantize(_QUANTUM))
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        # Supports the same specs as Decimal, e.g. f"{amount:.2f}" or f"{amount:<15}"
+        if not spec:
+            return str(self)
+        return format(self.to_decimal().quantize(_QUANTUM), spec)
+
+
+ZERO = Money(0)
+
+
+def total_earnings(basic, da, hra, ma):
+    """Sum of the earning components."""
+    return Money.parse(basic) + Money.parse(da) + Money.parse(hra) + Money.parse(ma)
+
+
+def total_deductions(pf, insurance, tax):
+    """Sum of the deduction components."""
+    return Money.parse(pf) + Money.parse(insurance) + Money.parse(tax)
@@ -0,0 +1,221 @@
+"""
+Command-line interface for the Payroll Management System
+
+Runs payroll tasks without Tk or a display:
+
+    python payroll.py init
+    python payroll.py import employees.csv
+    python payroll.py run 2024-01
+    python payroll.py export salaries.csv.gz --period 2024-01
+    python payroll.py receipts 2024-01 --consolidated
+    python payroll.py rules set hra "0.4 * basic" --department Sales
+
+(or ``python -m payroll ...`` from this directory). Modules are imported
+by the command that needs them, so simple commands start quickly and
+only ``receipts`` loads ReportLab.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+
+def open_database(args):
+    """Point the data layer at --db and bring an existing schema up to date."""
+    import database
+    if args.db:
+        database.configure(db_path=args.db)
+    # Connecting would create an empty database for a mistyped path
+    if not os.path.exists(database.DB_PATH):
+        raise SystemExit(f"{database.DB_PATH} does not exist, run 'payroll.py init' first")
+    with database.connection() as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            raise SystemExit(f"{database.DB_PATH} is not initialized, run 'payroll.py init' first")
+        database.migrate(conn)
+    return database
+
+
+def report(args, stats, summary):
+    """Print a command's result as JSON (--json) or as one line of text."""
+    if args.json:
+        print(json.dumps(stats, indent=1, default=str))
+    else:
+        print(summary)
+
+
+def cmd_init(args):
+    import database
+    if args.db:
+        database.configure(db_path=args.db)
+    database.initialize_db()
+    return 0
+
+
+def cmd_import(args):
+    open_database(args)
+    import importer
+
+    def progress(written, rejected):
+        if args.verbose:
+            print(f"{written} imported, {rejected} rejected", file=sys.stderr)
+
+    stats = importer.import_employees(args.path, chunk_size=args.chunk_size,
+                                      report_path=args.report, progress=progress)
+    summary = (f"Imported {stats['imported']} of {stats['read']} employees in "
+               f"{stats['seconds']} s ({stats['rows_per_second']} rows/s)")
+    if stats["rejected"]:
+        summary += f", {stats['rejected']} rejected (see {stats['report_path']})"
+    report(args, stats, summary)
+    return 1 if stats["rejected"] else 0
+
+
+def cmd_run(args):
+    open_database(args)
+    import payroll_run
+
+    policy = payroll_run.ComponentPolicy(carry_forward=not args.no_carry_forward,
+                                         default_basic=args.default_basic)
+
+    def progress(done, total):
+        if args.verbose:
+            print(f"{done}/{total} salaries written", file=sys.stderr)
+
+    stats = payroll_run.run_payroll(args.period, policy=policy, departments=args.department,
+                                    emp_ids=args.emp_id, pay_date=args.pay_date,
+                                    progress=progress)
+    report(args, stats, f"Paid {stats['inserted']} employees for {stats['period']} "
+                        f"in {stats['seconds']} s ({stats['rows_per_second']} rows/s)")
+    return 0
+
+
+def cmd_export(args):
+    open_database(args)
+    import exporter
+    return exporter.run(args)
+
+
+def cmd_receipts(args):
+    open_database(args)
+    import receipt_pdf
+
+    salary_ids = args.ids or None
+    period = args.period
+    output_dir = args.output_dir or receipt_pdf.RECEIPT_DIR
+    if period is None and salary_ids is None:
+        raise SystemExit("Give a pay period or --ids")
+
+    if args.consolidated:
+        stats = receipt_pdf.generate_consolidated(period, salary_ids, output_dir=output_dir)
+        summary = (f"Wrote {stats['pages']} payslips to {stats['path']} in "
+                   f"{stats['seconds']} s ({stats['pages_per_second']} pages/s)")
+    else:
+        def progress(done, total):
+            if args.verbose:
+                print(f"{done}/{total} receipts rendered", file=sys.stderr)
+
+        stats = receipt_pdf.generate_receipts(period, salary_ids, output_dir=output_dir,
+                                              processes=args.processes, progress=progress)
+        summary = (f"Wrote {stats['receipts']} receipts to {stats['output_dir']} in "
+                   f"{stats['seconds']} s ({stats['pages_per_second']} pages/s)")
+    report(args, stats, summary)
+    return 0
+
+
+def cmd_rules_list(args):
+    open_database(args)
+    import salary_rules
+    rules = salary_rules.list_rules()
+    if args.json:
+        print(json.dumps([rule._asdict() for rule in rules], indent=1))
+        return 0
+    for rule in rules:
+        scope = " / ".join(part for part in (rule.department, rule.designation) if part) or "everybody"
+        print(f"{rule.id:>4}  {rule.component} = {rule.formula}  [{scope}, v{rule.version}]")
+    return 0
+
+
+def cmd_rules_set(args):
+    open_database(args)
+    import salary_rules
+    salary_rules.save_rule(args.component, args.formula, args.department, args.designation)
+    return 0
+
+
+def cmd_rules_delete(args):
+    open_database(args)
+    import salary_rules
+    if not salary_rules.delete_rule(args.id):
+        raise SystemExit(f"No salary rule with id {args.id}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="payroll", description="Payroll Management System tasks")
+    parser.add_argument("--db", help="database file (default: PAYROLL_DB or payroll.db)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="report progress on stderr")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    command = commands.add_parser("init", help="create the database and apply migrations")
+    command.set_defaults(func=cmd_init)
+
+    command = commands.add_parser("import", help="import employees from CSV or JSONL")
+    command.add_argument("path", help=".csv or .jsonl file, optionally .gz")
+    command.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction")
+    command.add_argument("--report", help="rejected rows file (default: <path>.errors.csv)")
+    command.set_defaults(func=cmd_import)
+
+    command = commands.add_parser("run", help="pay every employee for a period")
+    command.add_argument("period", help="pay period, YYYY-MM")
+    command.add_argument("--department", action="append", help="only this department (repeatable)")
+    command.add_argument("--emp-id", action="append", help="only this employee (repeatable)")
+    command.add_argument("--pay-date", help="date written on the salaries (default: last day)")
+    command.add_argument("--no-carry-forward", action="store_true",
+                         help="ignore previous salaries and derive components from the basic")
+    command.add_argument("--default-basic", default="30000",
+                         help="basic salary for employees with no history")
+    command.set_defaults(func=cmd_run)
+
+    command = commands.add_parser("export", help="export salary history to CSV or JSONL")
+    # Same options as exporter.py, which only needs the standard library and database
+    import exporter
+    exporter.add_arguments(command)
+    command.set_defaults(func=cmd_export)
+
+    command = commands.add_parser("receipts", help="render PDF payslips for a period")
+    command.add_argument("period", nargs="?", help="pay period, YYYY-MM")
+    command.add_argument("--ids", type=int, nargs="+", help="salary ids instead of a period")
+    command.add_argument("--output-dir", help="default: PAYROLL_RECEIPT_DIR or receipts")
+    command.add_argument("--processes", type=int, help="render processes (default: one per CPU)")
+    command.add_argument("--consolidated", action="store_true",
+                         help="write one multi-page PDF with a page index")
+    command.set_defaults(func=cmd_receipts)
+
+    command = commands.add_parser("rules", help="list or change allowance and deduction formulas")
+    actions = command.add_subparsers(dest="action", metavar="action", required=True)
+    action = actions.add_parser("list", help="show every rule")
+    action.set_defaults(func=cmd_rules_list)
+    action = actions.add_parser("set", help="add a rule or replace its formula")
+    action.add_argument("component", help="da, hra, ma, pf, insurance or a parameter name")
+    action.add_argument("formula", help="e.g. \"min(0.12 * basic, pf_cap)\"")
+    action.add_argument("--department", default="", help="only this department")
+    action.add_argument("--designation", default="", help="only this designation")
+    action.set_defaults(func=cmd_rules_set)
+    action = actions.add_parser("delete", help="remove a rule")
+    action.add_argument("id", type=int)
+    action.set_defaults(func=cmd_rules_delete)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Bulk payroll runs for the Payroll Management System
+"""
+
+import time
+import database
+import salary_kernel
+import salary_rules
+import tax
+from money import Money
+from validation import period_bounds
+
+# Salary components written for every employee, in salaries column order
+COMPONENTS = ("basic_salary", "da", "hra", "ma", "pf", "insurance", "tax")
+
+
+class ComponentPolicy:
+    """Decides the salary components each employee gets in a payroll run.
+
+    By default an employee's most recent salary record is carried forward.
+    Employees with no history are paid a basic salary looked up by
+    designation, with allowances and deductions derived from it by rate.
+    Components that have a formula in ``rules`` (salary_rules.py) take the
+    rule's amount instead, for new and carried-forward salaries alike.
+    Income tax is always worked out from ``tax_table`` (the progressive
+    slabs in tax.py), so carried-forward salaries follow slab changes.
+    """
+
+    def __init__(self, carry_forward=True, default_basic=30000, basic_by_designation=None,
+                 da_rate=0.10, hra_rate=0.20, ma=2000, pf_rate=0.06, insurance=1500, tax_table=None,
+                 rules=None):
+        self.carry_forward = carry_forward
+        self.default_basic = Money.parse(default_basic)
+        self.basic_by_designation = {
+            designation: Money.parse(amount)
+            for designation, amount in (basic_by_designation or {}).items()
+        }
+        self.da_rate = da_rate
+        self.hra_rate = hra_rate
+        self.ma = Money.parse(ma)
+        self.pf_rate = pf_rate
+        self.insurance = Money.parse(insurance)
+        self.tax_table = tax_table or tax.get_table()
+        self.rules = rules if rules is not None else salary_rules.get_rules()
+
+    def components(self, employee, previous=None):
+        """Return (basic, da, hra, ma, pf, insurance) as Money values.
+
+        ``employee`` is an (emp_id, name, department, designation) row and
+        ``previous`` the employee's last salary components, if any.
+        """
+        department, designation = employee[2], employee[3]
+        if self.carry_forward and previous is not None:
+            parts = tuple(previous[:6])
+        else:
+            basic = self.basic_by_designation.get(designation, self.default_basic)
+            parts = (
+                basic,
+                basic * self.da_rate,
+                basic * self.hra_rate,
+                self.ma,
+                basic * self.pf_rate,
+                self.insurance,
+            )
+        derived = self.rules.components(parts[0], department, designation)
+        if not derived:
+            return parts
+        return (parts[0],) + tuple(derived.get(name, part)
+                                   for name, part in zip(salary_rules.COMPONENTS, parts[1:]))
+
+
+# Newest salary of every employee, for carrying components forward
+LATEST_COMPONENTS_QUERY = """
+    SELECT emp_id, basic_salary, da, hra, ma, pf, insurance, tax FROM salaries
+    WHERE id IN (SELECT MAX(id) FROM salaries GROUP BY emp_id)
+"""
+
+
+def build_employees_query(start, end, departments=None, emp_ids=None):
+    """Return (sql, params) for employees matching the filters with no salary in [start, end)."""
+    query = """
+        SELECT e.emp_id, e.name, e.department, e.designation FROM employees e
+        WHERE NOT EXISTS (
+            SELECT 1 FROM salaries s WHERE s.emp_id = e.emp_id AND s.date >= ? AND s.date < ?)
+    """
+    params = [start, end]
+    if departments:
+        query += f" AND e.department IN ({', '.join('?' * len(departments))})"
+        params.extend(departments)
+    if emp_ids:
+        query += f" AND e.emp_id IN ({', '.join('?' * len(emp_ids))})"
+        params.extend(emp_ids)
+    return query + " ORDER BY e.emp_id", params
+
+
+def _employees_to_pay(cursor, start, end, departments, emp_ids):
+    """Employees matching the filters who have no salary in [start, end)."""
+    cursor.execute(*build_employees_query(start, end, departments, emp_ids))
+    return cursor.fetchall()
+
+
+def _latest_components(cursor):
+    """Map emp_id -> components of that employee's most recent salary."""
+    cursor.execute(LATEST_COMPONENTS_QUERY)
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def run_payroll(period, policy=None, departments=None, emp_ids=None, pay_date=None,
+                progress=None, chunk_size=1000):
+    """Create salary records for every matching employee for one pay period.
+
+    All rows are written with executemany inside a single transaction, so a
+    run either pays everybody or nobody. Employees already paid in the
+    period are skipped, which makes re-running a period safe.
+
+    ``progress`` is called as progress(done, total) after each chunk.
+    Returns a dict of counts, elapsed seconds and rows per second.
+    """
+    policy = policy or ComponentPolicy()
+    start, end, last_day = period_bounds(period)
+    pay_date = pay_date or last_day
+    started = time.perf_counter()
+
+    with database.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Take the write lock up front so the run can't fail half way
+            cursor.execute("BEGIN IMMEDIATE")
+            employees = _employees_to_pay(cursor, start, end, departments, emp_ids)
+            previous = _latest_components(cursor) if policy.carry_forward else {}
+            total = len(employees)
+
+            inserted = 0
+            for offset in range(0, total, chunk_size):
+                chunk = employees[offset:offset + chunk_size]
+                components = [policy.components(employee, previous.get(employee[0]))
+                              for employee in chunk]
+                # Tax and net salary for the whole chunk in vectorized passes
+                columns = list(zip(*components))
+                taxes = policy.tax_table.monthly_tax_batch(tax.taxable_income(*columns))
+                net = salary_kernel.compute(*columns, taxes)["net"]
+                rows = [(employee[0], employee[1], employee[2], *parts, Money(int(t)), Money(int(amount)),
+                         pay_date)
+                        for employee, parts, t, amount in zip(chunk, components, taxes, net)]
+                cursor.executemany(database.INSERT_SALARY, rows)
+                inserted += len(rows)
+                if progress:
+                    progress(inserted, total)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    seconds = time.perf_counter() - started
+    return {
+        "period": period,
+        "pay_date": pay_date,
+        "inserted": inserted,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(inserted / seconds, 1) if seconds > 0 else None,
+    }
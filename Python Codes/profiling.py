@@ -0,0 +1,231 @@
+"""
+Profiling hooks for the Payroll Management System
+
+Actions of the main window, the background jobs they start and the
+callbacks that show the results are timed as operations. Each records
+its wall time, its SQL time (executing statements and fetching their
+rows) and the time spent holding a database connection (connection
+time, which also includes any Python work done inside the
+database.connection() block). Operations slower than PAYROLL_SLOW_MS are
+appended to the slow operation log as JSON lines. Set PAYROLL_PROFILE to
+a comma separated list of action names (or *) to also save a cProfile
+dump of each run of those actions. Everything is off unless
+PAYROLL_PROFILING=1 is set.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# Instrumentation on/off; when off every hook is a single flag check
+ENABLED = os.environ.get("PAYROLL_PROFILING", "") not in ("", "0")
+
+# Operations slower than this (milliseconds) go to the slow log
+SLOW_MS = float(os.environ.get("PAYROLL_SLOW_MS", "250"))
+
+SLOW_LOG = os.environ.get("PAYROLL_SLOW_LOG", "slow_operations.log")
+
+# Actions to capture with cProfile ("*" for all) and where the dumps go
+PROFILE_ACTIONS = frozenset(name.strip() for name in os.environ.get("PAYROLL_PROFILE", "").split(",")
+                            if name.strip())
+PROFILE_DIR = os.environ.get("PAYROLL_PROFILE_DIR", "profiles")
+
+_local = threading.local()
+_lock = threading.Lock()
+# cProfile can only run one profiler per process (Python 3.12+ raises otherwise)
+_profile_lock = threading.Lock()
+_totals = {}
+
+
+def configure(enabled=None, slow_ms=None, slow_log=None, profile_actions=None, profile_dir=None):
+    """Change the profiling settings at run time."""
+    global ENABLED, SLOW_MS, SLOW_LOG, PROFILE_ACTIONS, PROFILE_DIR
+    if enabled is not None:
+        ENABLED = enabled
+    if slow_ms is not None:
+        SLOW_MS = slow_ms
+    if slow_log is not None:
+        SLOW_LOG = slow_log
+    if profile_actions is not None:
+        PROFILE_ACTIONS = frozenset(profile_actions)
+    if profile_dir is not None:
+        PROFILE_DIR = profile_dir
+
+
+class Operation:
+    """Times one action, job or callback on the current thread.
+
+    Nested operations add their SQL, connection and waiting time to the
+    enclosing one. Time spent waiting for the user (see paused) is not
+    counted as wall time. Only one operation in the process is profiled
+    with cProfile at a time; the others are just timed.
+    """
+
+    def __init__(self, name, phase="action", **details):
+        self.name = name
+        self.phase = phase
+        self.details = details
+        self.sql = 0.0
+        self.queries = 0
+        self.connection = 0.0
+        self.connections = 0
+        self.waited = 0.0
+        self.profile = None
+
+    def __enter__(self):
+        self.outer = getattr(_local, "operation", None)
+        _local.operation = self
+        if (self.name in PROFILE_ACTIONS or "*" in PROFILE_ACTIONS) \
+                and _profile_lock.acquire(blocking=False):
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall = time.perf_counter() - self.started - self.waited
+        if self.profile:
+            self.profile.disable()
+            _profile_lock.release()
+            _dump_profile(self)
+        _local.operation = self.outer
+        if self.outer is not None:
+            self.outer.sql += self.sql
+            self.outer.queries += self.queries
+            self.outer.connection += self.connection
+            self.outer.connections += self.connections
+            self.outer.waited += self.waited
+        _record(self, wall, failed=exc_type is not None)
+        return False
+
+
+def operation(name, phase="action", **details):
+    """Context manager timing an operation, or a no-op when disabled."""
+    if not ENABLED:
+        return contextlib.nullcontext()
+    return Operation(name, phase, **details)
+
+
+def action(func):
+    """Decorator timing a method as the action named after it."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return func(*args, **kwargs)
+        with Operation(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def current():
+    """Name of the operation running on this thread, if any."""
+    op = getattr(_local, "operation", None)
+    return op.name if op is not None else None
+
+
+def add_sql_time(seconds, statements=0):
+    """Charge time spent executing statements or fetching rows to the running operation."""
+    op = getattr(_local, "operation", None)
+    if op is not None:
+        op.sql += seconds
+        op.queries += statements
+
+
+def add_connection_time(seconds):
+    """Charge time spent holding a database connection to the running operation."""
+    op = getattr(_local, "operation", None)
+    if op is not None:
+        op.connection += seconds
+        op.connections += 1
+
+
+@contextlib.contextmanager
+def paused():
+    """Leave the enclosed time (e.g. a dialog waiting for the user) out of the timing."""
+    op = getattr(_local, "operation", None)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if op is not None:
+            op.waited += time.perf_counter() - started
+
+
+class UserWaits:
+    """Wraps a module of blocking dialogs (tkinter.messagebox) so their time is paused."""
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with paused():
+                return func(*args, **kwargs)
+        return wrapper
+
+
+def _record(op, wall, failed=False):
+    key = f"{op.name}:{op.phase}"
+    with _lock:
+        totals = _totals.setdefault(key, {"count": 0, "wall_ms": 0.0, "sql_ms": 0.0,
+                                            "connection_ms": 0.0, "max_ms": 0.0})
+        totals["count"] += 1
+        totals["wall_ms"] += wall * 1000
+        totals["sql_ms"] += op.sql * 1000
+        totals["connection_ms"] += op.connection * 1000
+        totals["max_ms"] = max(totals["max_ms"], wall * 1000)
+
+    if wall * 1000 >= SLOW_MS:
+        entry = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "operation": op.name,
+            "phase": op.phase,
+            "wall_ms": round(wall * 1000, 1),
+            "sql_ms": round(op.sql * 1000, 1),
+            "queries": op.queries,
+            "connection_ms": round(op.connection * 1000, 1),
+            "connections": op.connections,
+            "thread": threading.current_thread().name,
+        }
+        if failed:
+            entry["failed"] = True
+        entry.update(op.details)
+        try:
+            with _lock, open(SLOW_LOG, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Could not write the slow operation log: {e}")
+
+
+def _dump_profile(op):
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = os.path.join(PROFILE_DIR, f"{op.name}-{op.phase}-{stamp}.pstats")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        op.profile.dump_stats(path)
+    except OSError as e:
+        print(f"Could not save the profile of {op.name}: {e}")
+
+
+def summary():
+    """Totals per operation and phase since start-up, in milliseconds."""
+    with _lock:
+        return {key: {name: round(value, 3) for name, value in totals.items()}
+                for key, totals in _totals.items()}
+
+
+def reset():
+    with _lock:
+        _totals.clear()
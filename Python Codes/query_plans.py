@@ -0,0 +1,269 @@
+"""
+Query plan checks for the Payroll Management System
+
+A catalog of the SQL the application runs, checked with EXPLAIN QUERY
+PLAN. A query fails if its plan reads the whole salaries or employees
+table (a SCAN) unless the catalog says that scan is intended:
+
+    python query_plans.py                 # against a seeded synthetic database
+    python query_plans.py --db payroll.db # against a real database
+    python query_plans.py -v              # print every plan
+
+Exits with status 1 if any query fails. The catalog uses the statement
+constants and query builders of the modules that run them, so it checks
+the SQL as it is; add new ones to catalog() when they are added to the
+code.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from collections import namedtuple
+import database
+
+# Tables too large to be read in full by an interactive query
+INDEXED_TABLES = ("salaries", "employees")
+
+# allow_scan lists tables the query is meant to read in full; note says why
+CatalogQuery = namedtuple("CatalogQuery", "name source sql params allow_scan note",
+                          defaults=((), (), None))
+
+# Sample values used for query parameters
+EMP_ID = "E000001"
+SALARY_ID = 1
+PERIOD = "2024-06"
+
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_NOT_ALIASES = {"where", "on", "join", "left", "inner", "cross", "order", "group", "limit", "set",
+                "using", "natural", "outer"}
+
+
+def catalog():
+    """Every query run by the application, with sample parameters."""
+    # Imported here so that importing this module stays cheap
+    import exporter
+    import importer
+    import login
+    import main
+    import payroll_run
+    import receipt_pdf
+    import salary_rules
+    import validation
+
+    employee = (EMP_ID, "n", "e", "p", "a", "g", "IT", "Developer", "2020-01-01", "x")
+    salary = (1, 1, 1, 1, 1, 1, 1, 1)
+
+    queries = [
+        # Employee tab
+        CatalogQuery("employee ids", "main.fetch_employee_ids", main.EMPLOYEE_IDS_QUERY, (),
+                     ("employees",), "lists every employee for the salary tab"),
+        CatalogQuery("employee row", "main.fetch_employee_row", main.EMPLOYEE_ROW_QUERY, (EMP_ID,)),
+        CatalogQuery("employee exists", "main.save_employee", main.EMPLOYEE_EXISTS_QUERY, (EMP_ID,)),
+        CatalogQuery("employee insert", "main.save_employee", main.INSERT_EMPLOYEE, employee),
+        CatalogQuery("employee update", "main.update_employee", main.UPDATE_EMPLOYEE,
+                     employee[1:9] + (EMP_ID,)),
+        CatalogQuery("employee and password update", "main.update_employee",
+                     main.UPDATE_EMPLOYEE_AND_PASSWORD, employee[1:] + (EMP_ID,)),
+        CatalogQuery("employee delete", "main.delete_employee_records", main.DELETE_EMPLOYEE, (EMP_ID,)),
+        CatalogQuery("employee salary ids", "main.delete_employee_records",
+                     main.EMPLOYEE_SALARY_IDS_QUERY, (EMP_ID,)),
+        CatalogQuery("employee salaries delete", "main.delete_employee_records",
+                     main.DELETE_EMPLOYEE_SALARIES, (EMP_ID,)),
+        CatalogQuery("employee cache", "database.EmployeeCache.get", database.EMPLOYEE_QUERY, (EMP_ID,)),
+        CatalogQuery("search index check", "database._has_search_index", database.SEARCH_INDEX_QUERY),
+        CatalogQuery("employee search", "database.search_employees", database.SEARCH_QUERY,
+                     (database.build_search_query("jo", "name"), -1)),
+        CatalogQuery("employee search without FTS5", "database.search_employees",
+                     database.like_search_query("name"), ("%jo%", -1),
+                     ("employees",), "substring match, only used by SQLite builds without FTS5"),
+
+        # Salary tab
+        CatalogQuery("salary row", "main.fetch_salary_row", main.SALARY_ROW_QUERY, (SALARY_ID,)),
+        CatalogQuery("salary insert", "main.insert_salary", database.INSERT_SALARY,
+                     (EMP_ID, "n", "IT") + salary + ("2024-06-30",)),
+        CatalogQuery("salary update", "main.update_salary", main.UPDATE_SALARY,
+                     (EMP_ID,) + salary + (SALARY_ID,)),
+        CatalogQuery("salary delete", "main.delete_salary", main.DELETE_SALARY, (SALARY_ID,)),
+        CatalogQuery("receipt row", "main.fetch_receipt_row", main.RECEIPT_ROW_QUERY, (SALARY_ID,)),
+
+        # Login
+        CatalogQuery("admin login", "login.authenticate", login.ADMIN_LOGIN_QUERY, ("admin",)),
+        CatalogQuery("employee login", "login.authenticate", login.EMPLOYEE_LOGIN_QUERY, (EMP_ID,)),
+
+        # Data layer
+        CatalogQuery("setup sample salaries", "database.initialize_db",
+                     database.SALARY_COUNT_QUERY, (EMP_ID,)),
+        CatalogQuery("latency probe", "database.measure_latency", database.LATENCY_QUERY, (EMP_ID,)),
+        CatalogQuery("payroll summary rebuild", "database._fill_payroll_summary",
+                     database.SUMMARY_TOTALS_QUERY, (), ("salaries",),
+                     "recomputes the summary from every salary"),
+
+        # Employee import
+        CatalogQuery("employee upsert", "importer.import_employees", importer.UPSERT_EMPLOYEE, employee),
+
+        # Payroll runs
+        CatalogQuery("employees to pay", "payroll_run._employees_to_pay",
+                     *payroll_run.build_employees_query(*validation.period_bounds(PERIOD)[:2]),
+                     ("employees",), "a run considers every employee"),
+        CatalogQuery("employees of a department to pay", "payroll_run._employees_to_pay",
+                     *payroll_run.build_employees_query(*validation.period_bounds(PERIOD)[:2], ["IT"]),
+                     ("employees",), "a department is a large share of all employees, reading them in "
+                     "emp_id order saves a sort"),
+        CatalogQuery("employees by id to pay", "payroll_run._employees_to_pay",
+                     *payroll_run.build_employees_query(*validation.period_bounds(PERIOD)[:2],
+                                                        emp_ids=[EMP_ID])),
+        CatalogQuery("latest components", "payroll_run._latest_components",
+                     payroll_run.LATEST_COMPONENTS_QUERY, (), ("salaries",),
+                     "newest salary of every employee, read once per run"),
+
+        # Salary rules
+        CatalogQuery("rule version", "salary_rules.get_rules", salary_rules.RULE_VERSION_QUERY),
+        CatalogQuery("rules", "salary_rules.get_rules", salary_rules.RULES_QUERY),
+        CatalogQuery("rules listing", "salary_rules.list_rules", salary_rules.LIST_RULES_QUERY),
+        CatalogQuery("rule save", "salary_rules.save_rule", salary_rules.SAVE_RULE,
+                     ("hra", "0.4 * basic", "", "")),
+        CatalogQuery("rule scope", "salary_rules.delete_rule", salary_rules.RULE_SCOPE_QUERY, (1,)),
+        CatalogQuery("rule delete", "salary_rules.delete_rule", salary_rules.DELETE_RULE, (1,)),
+
+        # Receipts
+        CatalogQuery("receipts for a period", "receipt_pdf.fetch_receipt_data",
+                     *receipt_pdf.build_receipt_query(PERIOD)),
+        CatalogQuery("receipts by id", "receipt_pdf.fetch_receipt_data",
+                     *receipt_pdf.build_receipt_query(salary_ids=[1, 2, 3])),
+        CatalogQuery("receipts by id in a period", "receipt_pdf.fetch_receipt_data",
+                     *receipt_pdf.build_receipt_query(PERIOD, [1, 2, 3])),
+    ]
+
+    # Payroll summary reports, one per kind of filter
+    for label, filters in (("all", {}), ("department", {"department": "IT"}),
+                           ("months", {"start_month": "2024-01", "end_month": PERIOD})):
+        queries.append(CatalogQuery(f"payroll summary {label}", "database.payroll_summary",
+                                    *database.build_summary_query(**filters)))
+
+    # Exports, one per kind of filter
+    for label, filters, allow_scan, note in (
+            ("everything", {}, ("salaries",), "exports the whole history"),
+            ("employee", {"emp_id": EMP_ID}, (), None),
+            ("department", {"department": "IT"}, ("salaries",),
+             "a department is a large share of all salaries, reading them in id order beats "
+             "an index plus a sort"),
+            ("period", {"period": PERIOD}, (), None),
+            ("department and period", {"department": "IT", "period": PERIOD}, (), None),
+            ("date range", {"start": "2024-01-01", "end": "2024-03-31"}, (), None)):
+        sql, params = exporter.build_query(**filters)
+        queries.append(CatalogQuery(f"export {label}", "exporter.build_query", sql, params,
+                                    allow_scan, note))
+
+    # The virtual tables of the employee and salary tabs
+    windows = (
+        ("employee table", database.TableWindow("employees", "emp_id", columns=main.EMPLOYEE_COLUMNS),
+         EMP_ID, ("employees",)),
+        ("salary table", database.TableWindow("salaries", "id", columns=main.SALARY_COLUMNS),
+         SALARY_ID, ("salaries",)),
+        ("own salary table", database.TableWindow("salaries", "id", where="emp_id = ?", params=(EMP_ID,),
+                                                  columns=main.SALARY_COLUMNS), SALARY_ID, ()),
+    )
+    for label, window, sample, whole_table in windows:
+        for purpose, sql, params in window.statements(sample):
+            allow_scan, note = (), None
+            if whole_table and purpose == "count":
+                allow_scan, note = whole_table, "the scroll bar needs the row count"
+            elif whole_table and purpose == "first page":
+                allow_scan, note = whole_table, "reads in key order and stops after one page"
+            queries.append(CatalogQuery(f"{label} {purpose}", "database.TableWindow", sql, params,
+                                        allow_scan, note))
+
+    return queries
+
+
+def table_aliases(sql):
+    """Map the names a query uses for its tables (aliases too) to the tables."""
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in _NOT_ALIASES:
+            aliases[alias] = table
+    return aliases
+
+
+def explain(conn, sql, params=()):
+    """The detail lines of a query's EXPLAIN QUERY PLAN."""
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def full_scans(plan, sql):
+    """(table, plan line) for every full scan of an INDEXED_TABLES table."""
+    aliases = table_aliases(sql)
+    scans = []
+    for detail in plan:
+        match = re.match(r"SCAN (\w+)", detail)
+        if match:
+            table = aliases.get(match.group(1), match.group(1))
+            if table in INDEXED_TABLES:
+                scans.append((table, detail))
+    return scans
+
+
+def check(conn, queries=None):
+    """Explain every catalog query; returns a list of result dicts."""
+    results = []
+    for query in queries if queries is not None else catalog():
+        plan = explain(conn, query.sql, query.params)
+        unexpected = [detail for table, detail in full_scans(plan, query.sql)
+                      if table not in query.allow_scan]
+        results.append({
+            "name": query.name,
+            "source": query.source,
+            "plan": plan,
+            "unexpected_scans": unexpected,
+            "ok": not unexpected,
+        })
+    return results
+
+
+def seeded_database(path, employees=2000, salaries=24000, seed=42):
+    """Create a synthetic database to explain the queries against."""
+    import benchmark
+    benchmark.generate_dataset(path, employees, salaries, seed)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Check the query plans of the application's SQL")
+    parser.add_argument("--db", help="database to check (default: a seeded synthetic database)")
+    parser.add_argument("--employees", type=int, default=2000, help="size of the seeded database")
+    parser.add_argument("--salaries", type=int, default=24000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            database.configure(db_path=args.db)
+        else:
+            path = os.path.join(tmp, "seeded.db")
+            seeded_database(path, args.employees, args.salaries, args.seed)
+            database.configure(db_path=path)
+        try:
+            with database.connection() as conn:
+                database.migrate(conn)
+                results = check(conn)
+        finally:
+            database.close_pool()
+
+    failed = [result for result in results if not result["ok"]]
+    for result in results:
+        if result["ok"] and not args.verbose:
+            continue
+        status = "ok  " if result["ok"] else "FAIL"
+        print(f"{status} {result['name']} ({result['source']})")
+        for detail in result["plan"]:
+            marker = "!" if detail in result["unexpected_scans"] else " "
+            print(f"   {marker} {detail}")
+    print(f"{len(results) - len(failed)} of {len(results)} query plans use indexes as expected")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,40 @@
+"""
+Receipt file names for the Payroll Management System
+
+Kept apart from receipt_pdf so the text export and the command line can
+name receipt files without importing ReportLab.
+"""
+
+import os
+import re
+from datetime import datetime
+
+# Where receipts are written unless a directory is given
+RECEIPT_DIR = os.environ.get("PAYROLL_RECEIPT_DIR", "receipts")
+
+# Characters not allowed in the parts of a receipt file name
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def filename_part(value):
+    """A value made safe for a file name: anything but A-Z, a-z, 0-9, _ and - becomes _.
+
+    Keeps IDs like '../x' or 'A/B' from pointing outside the receipt directory.
+    """
+    return _UNSAFE_FILENAME.sub("_", str(value))
+
+
+def receipt_filename(salary_data, output_dir=RECEIPT_DIR):
+    """Path of a batch receipt, stable so re-running a batch overwrites it."""
+    return os.path.join(output_dir,
+                        f"salary_receipt_{filename_part(salary_data[1])}_{filename_part(salary_data[0])}.pdf")
+
+
+def saved_receipt_filename(emp_id, extension, output_dir=RECEIPT_DIR):
+    """Path for a receipt saved from the receipt window, stamped with the time.
+
+    Creates the receipt directory if needed.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    return os.path.join(output_dir, f"salary_receipt_{filename_part(emp_id)}_{stamp}.{extension}")
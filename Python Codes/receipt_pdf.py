@@ -0,0 +1,383 @@
+"""
+PDF salary receipts for the Payroll Management System
+"""
+
+import io
+import json
+import os
+import statistics
+import time
+import timeit
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Frame
+from reportlab.pdfgen import canvas
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+import database
+import money
+import validation
+from receipt_files import RECEIPT_DIR, filename_part, receipt_filename
+
+# Receipts handed to a worker process at a time
+CHUNK_SIZE = 50
+
+# A salary record with the employee details a receipt needs, in the order
+# ReceiptGenerator expects
+RECEIPT_QUERY = """
+    SELECT s.id, s.emp_id, s.name, s.department, s.basic_salary, s.da, s.hra, s.ma,
+           s.pf, s.insurance, s.tax, s.net_salary, s.date,
+           e.address, e.designation, e.phone
+    FROM salaries s
+    JOIN employees e ON s.emp_id = e.emp_id
+"""
+
+
+class StaticParagraph(Paragraph):
+    """A Paragraph whose line breaking is worked out once and then reused.
+
+    Only safe for text that never changes, like the receipt header.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        if getattr(self, "_wrapped_width", None) != availWidth:
+            self._wrapped_size = Paragraph.wrap(self, availWidth, availHeight)
+            self._wrapped_width = availWidth
+        return self._wrapped_size
+
+
+class ReceiptTemplate:
+    """The parts of a receipt that are the same for every employee.
+
+    Stylesheets, paragraph and table styles, the header and footer
+    flowables and the column layout are built once; build() then only
+    creates the flowables that carry the employee's own values. Use
+    get_template() to share one instance per process.
+    """
+
+    COLUMN_WIDTHS = [2 * inch, 1 * inch, 2 * inch, 1 * inch]
+
+    def __init__(self):
+        styles_sheet = getSampleStyleSheet()
+        self.normal_style = styles_sheet['Normal']
+        self.italic_style = styles_sheet['Italic']
+
+        # Create custom paragraph style
+        self.title_style = ParagraphStyle(
+            'Title',
+            parent=styles_sheet['Title'],
+            alignment=1,  # Center
+            fontName='Helvetica-Bold',
+            fontSize=16)
+
+        # Style of the earnings and deductions table
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (3, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (3, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (3, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (3, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (3, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (3, 0), 12),
+            ('BACKGROUND', (0, -1), (3, -1), colors.beige),
+            ('FONTNAME', (0, -1), (3, -1), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+            ('ALIGN', (3, 1), (3, -1), 'RIGHT'),
+        ])
+
+        # Static flowables, laid out once and reused by every receipt
+        self.small_space = Spacer(1, 0.15 * inch)
+        self.large_space = Spacer(1, 0.25 * inch)
+        self.header = [
+            StaticParagraph("COMPANY NAME", self.title_style),
+            StaticParagraph("EMPLOYEE SALARY RECEIPT", self.title_style),
+            self.large_space,
+        ]
+        self.footer = [
+            StaticParagraph(
+                "This is a computer-generated receipt and does not require a signature.",
+                self.italic_style),
+        ]
+
+    def build(self, salary_data):
+        """Return the list of flowables for one salary receipt."""
+        # Extract data from salary_data tuple
+        (salary_id, emp_id, name, department, basic_salary, da, hra, ma,
+         pf, insurance, tax, net_salary, date, address, designation, phone) = salary_data[:16]
+
+        content = list(self.header)
+
+        # Add receipt info
+        content.append(
+            Paragraph(
+                f"Receipt No: {salary_id}                  Date: {date}",
+                self.normal_style))
+        content.append(self.small_space)
+
+        # Add employee info - one paragraph of lines lays out like six
+        # separate ones (Normal has no paragraph spacing) at a sixth of the cost
+        content.append(
+            Paragraph(
+                f"Employee ID: {emp_id}<br/>"
+                f"Employee Name: {name}<br/>"
+                f"Department: {department}<br/>"
+                f"Designation: {designation}<br/>"
+                f"Address: {address}<br/>"
+                f"Phone: {phone}",
+                self.normal_style))
+        content.append(self.small_space)
+
+        # Create earnings and deductions table
+        earnings_data = [
+            ["EARNINGS", "AMOUNT", "DEDUCTIONS", "AMOUNT"],
+            ["Basic Salary", f"{basic_salary:.2f}", "Provident Fund", f"{pf:.2f}"],
+            ["Dearness Allowance", f"{da:.2f}", "Insurance", f"{insurance:.2f}"],
+            ["House Rent Allowance", f"{hra:.2f}", "Tax", f"{tax:.2f}"],
+            ["Medical Allowance", f"{ma:.2f}", "", ""],
+            [
+                "Total Earnings", f"{money.total_earnings(basic_salary, da, hra, ma):.2f}",
+                "Total Deductions", f"{money.total_deductions(pf, insurance, tax):.2f}"
+            ],
+        ]
+        content.append(Table(earnings_data, colWidths=self.COLUMN_WIDTHS, style=self.table_style))
+        content.append(self.large_space)
+
+        # Add net salary
+        content.append(Paragraph(f"<b>Net Salary: {net_salary:.2f}</b>", self.normal_style))
+        content.append(self.large_space)
+
+        content.extend(self.footer)
+        return content
+
+
+_template = None
+
+
+def get_template():
+    """The process-wide receipt template, built on first use."""
+    global _template
+    if _template is None:
+        _template = ReceiptTemplate()
+    return _template
+
+
+def build_receipt(salary_data):
+    """Return the list of flowables for one salary receipt."""
+    return get_template().build(salary_data)
+
+
+def render_receipt_pdf(salary_data, filename):
+    """Write one receipt to ``filename`` and return its number of pages."""
+    doc = SimpleDocTemplate(filename, pagesize=letter)
+    doc.build(build_receipt(salary_data))
+    return doc.page
+
+
+def build_receipt_query(period=None, salary_ids=None):
+    """Return (sql, params) for receipt rows of a pay period and/or salary ids."""
+    clauses = []
+    params = []
+    if period:
+        start, end, last_day = validation.period_bounds(period)
+        clauses.append("s.date >= ? AND s.date < ?")
+        params.extend([start, end])
+    if salary_ids is not None:
+        clauses.append(f"s.id IN ({', '.join('?' * len(salary_ids))})")
+        params.extend(salary_ids)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return RECEIPT_QUERY + where + " ORDER BY s.id", params
+
+
+def fetch_receipt_data(period=None, salary_ids=None):
+    """Salary records with employee details for a pay period and/or ids."""
+    if salary_ids is not None:
+        salary_ids = list(salary_ids)
+        if not salary_ids:
+            return []
+
+    with database.connection() as conn:
+        if salary_ids is None:
+            return conn.execute(*build_receipt_query(period)).fetchall()
+
+        # Look ids up in chunks to stay under SQLite's bound parameter limit
+        rows = []
+        for offset in range(0, len(salary_ids), 500):
+            sql, params = build_receipt_query(period, salary_ids[offset:offset + 500])
+            rows.extend(conn.execute(sql, params).fetchall())
+        return sorted(rows, key=lambda row: row[0])
+
+
+def _render_chunk(rows, output_dir):
+    """Render a chunk of receipts; runs in a worker process."""
+    results = []
+    for row in rows:
+        started = time.perf_counter()
+        filename = receipt_filename(row, output_dir)
+        pages = render_receipt_pdf(row, filename)
+        results.append({
+            "salary_id": row[0],
+            "emp_id": row[1],
+            "path": filename,
+            "pages": pages,
+            "seconds": round(time.perf_counter() - started, 4),
+        })
+    return results
+
+
+def generate_receipts(period=None, salary_ids=None, output_dir=RECEIPT_DIR, processes=None,
+                      chunk_size=CHUNK_SIZE, progress=None):
+    """Render the receipts for a pay period ('YYYY-MM') or list of salary ids.
+
+    Receipts are rendered in parallel by a pool of ``processes`` worker
+    processes (one per CPU by default); small batches are rendered in this
+    process to skip the pool start-up. ``progress`` is called as
+    progress(done, total) as chunks finish. Returns a dict with per-file
+    timings and overall pages per second.
+    """
+    if period is None and salary_ids is None:
+        raise ValueError("Give a pay period or a list of salary ids")
+
+    rows = fetch_receipt_data(period, salary_ids)
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    chunks = [rows[offset:offset + chunk_size] for offset in range(0, len(rows), chunk_size)]
+
+    files = []
+    if processes == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            files.extend(_render_chunk(chunk, output_dir))
+            if progress:
+                progress(len(files), len(rows))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_render_chunk, chunk, output_dir) for chunk in chunks]
+            for future in as_completed(futures):
+                files.extend(future.result())
+                if progress:
+                    progress(len(files), len(rows))
+
+    seconds = time.perf_counter() - started
+    pages = sum(entry["pages"] for entry in files)
+    files.sort(key=lambda entry: entry["salary_id"])
+    return {
+        "period": period,
+        "output_dir": output_dir,
+        "receipts": len(files),
+        "pages": pages,
+        "seconds": round(seconds, 4),
+        "pages_per_second": round(pages / seconds, 1) if seconds > 0 else None,
+        "files": files,
+    }
+
+
+def render_consolidated_pdf(rows, filename, compress=True):
+    """Write many payslips into a single PDF, one per page.
+
+    Pages are drawn straight onto one canvas, so fonts, styles and the
+    document structure are shared and only one payslip's flowables exist
+    at a time. Each payslip gets a bookmark in the PDF outline. Returns an
+    index mapping each emp_id to the page number(s) of their payslips.
+    """
+    width, height = letter
+    pdf = canvas.Canvas(filename, pagesize=letter, pageCompression=1 if compress else 0)
+    pdf.setTitle("Salary Receipts")
+    template = get_template()
+    index = {}
+
+    for row in rows:
+        salary_id, emp_id, name = row[0], row[1], row[2]
+        page = pdf.getPageNumber()
+        key = f"salary_{salary_id}"
+        pdf.bookmarkPage(key)
+        pdf.addOutlineEntry(f"{emp_id} - {name} ({row[12]})", key, level=0)
+        index.setdefault(emp_id, []).append(page)
+
+        # Same margins as SimpleDocTemplate, so pages match single receipts
+        frame = Frame(inch, inch, width - 2 * inch, height - 2 * inch)
+        frame.addFromList(template.build(row), pdf)
+        pdf.showPage()
+
+    pdf.showOutline()
+    pdf.save()
+    return index
+
+
+def index_filename(filename):
+    """Path of the page index written next to a consolidated PDF."""
+    return os.path.splitext(filename)[0] + ".index.json"
+
+
+def load_index(filename):
+    """Read the emp_id -> page numbers index of a consolidated PDF."""
+    with open(index_filename(filename)) as file:
+        return json.load(file)
+
+
+def generate_consolidated(period=None, salary_ids=None, output_dir=RECEIPT_DIR, filename=None,
+                          compress=True):
+    """Render the payslips for a pay period or salary ids into one PDF.
+
+    Payslips are ordered by employee. The emp_id -> page index is saved as
+    JSON next to the PDF so a single slip can be located without parsing
+    the file. Returns a dict with paths, page count and pages per second.
+    """
+    if period is None and salary_ids is None:
+        raise ValueError("Give a pay period or a list of salary ids")
+
+    rows = sorted(fetch_receipt_data(period, salary_ids), key=lambda row: (row[1], row[0]))
+    os.makedirs(output_dir, exist_ok=True)
+    filename = filename or os.path.join(output_dir, f"salary_receipts_{filename_part(period or 'selection')}.pdf")
+
+    started = time.perf_counter()
+    index = render_consolidated_pdf(rows, filename, compress)
+    with open(index_filename(filename), "w") as file:
+        json.dump(index, file, indent=1)
+    seconds = time.perf_counter() - started
+
+    return {
+        "period": period,
+        "path": filename,
+        "index_path": index_filename(filename),
+        "pages": len(rows),
+        "bytes": os.path.getsize(filename),
+        "seconds": round(seconds, 4),
+        "pages_per_second": round(len(rows) / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def benchmark(count=50, repeat=7):
+    """Compare rendering with the shared template against rebuilding it per receipt.
+
+    Renders ``count`` sample receipts to memory each way per round, for
+    ``repeat`` rounds. The two ways take turns going first so drift and
+    warm-up hit both alike. Returns the min and median milliseconds per
+    receipt for each.
+    """
+    sample = (1, "EMP001", "John Doe", "IT", money.Money.parse(50000), money.Money.parse(5000),
+              money.Money.parse(10000), money.Money.parse(2000), money.Money.parse(3000),
+              money.Money.parse(1500), money.Money.parse(2500), money.Money.parse(60000),
+              "2024-01-31", "123 Main St", "Developer", "1234567890")
+
+    def render(template):
+        doc = SimpleDocTemplate(io.BytesIO(), pagesize=letter)
+        doc.build(template.build(sample))
+
+    template = get_template()
+    render(template)  # Warm up fonts and caches
+
+    runs = [("rebuilt", lambda: render(ReceiptTemplate())), ("cached", lambda: render(template))]
+    timings = {name: [] for name, run in runs}
+    for round_no in range(repeat):
+        for name, run in (runs if round_no % 2 == 0 else runs[::-1]):
+            timings[name].append(timeit.timeit(run, number=count) * 1000 / count)
+
+    result = {"receipts": count, "repeat": repeat}
+    for name, times in timings.items():
+        result[f"{name}_min_ms"] = round(min(times), 3)
+        result[f"{name}_median_ms"] = round(statistics.median(times), 3)
+    result["speedup"] = round(min(timings["rebuilt"]) / min(timings["cached"]), 2)
+    return result
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,129 @@
+"""
+Vectorized salary computation for the Payroll Management System
+"""
+
+from money import Money
+
+try:
+    import numpy as np
+except ImportError:
+    # Pure-Python fallback keeps the application usable without NumPy
+    np = None
+
+EARNINGS = ("basic", "da", "hra", "ma")
+DEDUCTIONS = ("pf", "insurance", "tax")
+COMPONENTS = EARNINGS + DEDUCTIONS
+RESULTS = COMPONENTS + ("earnings", "deductions", "net")
+
+
+class MinorUnits(list):
+    """A column of plain ints that are already minor units (pure-Python kernel output)."""
+
+
+def minor_units(cents):
+    """Mark a column of integer minor units, e.g. 150050 for 1500.50.
+
+    Returns an int64 array when NumPy is installed, otherwise a MinorUnits
+    list. Either passes through as_minor_units unchanged.
+    """
+    if np is not None:
+        return np.asarray(cents, dtype=np.int64)
+    return MinorUnits(cents)
+
+
+def as_minor_units(values):
+    """Convert a column of amounts to integer minor units.
+
+    Money values are unwrapped and floats, strings and Decimals are parsed
+    as amounts in major units, as Money.parse does. Columns already in
+    minor units must say so: NumPy integer arrays and scalars, and
+    MinorUnits lists (see minor_units), are taken as minor units whatever
+    their container. A bare int is ambiguous, so it is refused rather than
+    guessed.
+    """
+    if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        return values.astype(np.int64, copy=False)
+    if isinstance(values, MinorUnits):
+        return np.asarray(values, dtype=np.int64) if np is not None else values
+    cents = []
+    for value in values:
+        if isinstance(value, Money):
+            cents.append(value.cents)
+        elif np is not None and isinstance(value, np.integer):
+            cents.append(int(value))
+        elif isinstance(value, int):
+            raise TypeError(f"Ambiguous amount {value!r}: pass Money, a major unit string "
+                            f"or a minor_units() column")
+        else:
+            cents.append(Money.parse(value).cents)
+    return minor_units(cents)
+
+
+def compute(basic, da, hra, ma, pf, insurance, tax, departments=None):
+    """Compute earnings, deductions and net salary for whole columns at once.
+
+    Each argument is a column (list or array) with one entry per salary
+    record. Arithmetic is done on int64 minor units, so results are exact.
+    Returns a dict with "earnings", "deductions" and "net" columns in minor
+    units, "totals" as Money per component, and, if ``departments`` is
+    given, "by_department" mapping each department to its count and totals.
+    """
+    columns = dict(zip(COMPONENTS, (as_minor_units(column) for column in
+                                    (basic, da, hra, ma, pf, insurance, tax))))
+    if np is not None:
+        columns["earnings"] = columns["basic"] + columns["da"] + columns["hra"] + columns["ma"]
+        columns["deductions"] = columns["pf"] + columns["insurance"] + columns["tax"]
+        columns["net"] = columns["earnings"] - columns["deductions"]
+        totals = {name: Money(int(columns[name].sum())) for name in RESULTS}
+    else:
+        columns["earnings"] = MinorUnits(sum(parts) for parts in zip(*(columns[name] for name in EARNINGS)))
+        columns["deductions"] = MinorUnits(sum(parts) for parts in zip(*(columns[name] for name in DEDUCTIONS)))
+        columns["net"] = MinorUnits(e - d for e, d in zip(columns["earnings"], columns["deductions"]))
+        totals = {name: Money(sum(columns[name])) for name in RESULTS}
+
+    result = {
+        "earnings": columns["earnings"],
+        "deductions": columns["deductions"],
+        "net": columns["net"],
+        "totals": totals,
+    }
+    if departments is not None:
+        result["by_department"] = _department_sums(columns, departments)
+    return result
+
+
+def _department_sums(columns, departments):
+    """Group every column by department in a single pass."""
+    departments = [department or "" for department in departments]
+    if np is not None:
+        labels, group = np.unique(np.array(departments, dtype=str), return_inverse=True)
+        counts = np.bincount(group, minlength=len(labels))
+        sums = {}
+        for name in RESULTS:
+            # np.add.at keeps int64 exact, unlike bincount's float weights
+            sums[name] = np.zeros(len(labels), dtype=np.int64)
+            np.add.at(sums[name], group, columns[name])
+        return {
+            str(label): {"count": int(counts[i]),
+                         **{name: Money(int(sums[name][i])) for name in RESULTS}}
+            for i, label in enumerate(labels)
+        }
+
+    grouped = {}
+    for i, department in enumerate(departments):
+        entry = grouped.setdefault(department, {"count": 0, **{name: 0 for name in RESULTS}})
+        entry["count"] += 1
+        for name in RESULTS:
+            entry[name] += columns[name][i]
+    return {
+        department: {"count": entry["count"], **{name: Money(entry[name]) for name in RESULTS}}
+        for department, entry in sorted(grouped.items())
+    }
+
+
+def net_salary(basic, da, hra, ma, pf, insurance, tax):
+    """Net salary for a single record, computed by the same kernel as batches."""
+    result = compute([Money.parse(basic)], [Money.parse(da)], [Money.parse(hra)],
+                     [Money.parse(ma)], [Money.parse(pf)], [Money.parse(insurance)],
+                     [Money.parse(tax)])
+    return Money(int(result["net"][0]))
@@ -0,0 +1,353 @@
+"""
+Formula rules for allowances and deductions in the Payroll Management System
+
+Rules are stored in the salary_rules table, one formula per component,
+for everybody or for a department and/or designation:
+
+    hra = 0.4 * basic
+    pf_cap = 1800
+    pf = min(0.12 * basic, pf_cap)
+    insurance = 2000 if basic > 50000 else 1500
+
+Formulas may use basic, the other rules (components or parameters such as
+pf_cap), numbers, + - * /, comparisons, "x if condition else y" and the
+functions min, max, abs and round. They are parsed once with the ast
+module, checked against that grammar and compiled into plain Python
+closures, so no formula is ever passed to eval. Compiled formulas are
+cached by their text and the rules in use are reloaded only when the rule
+version changes.
+"""
+
+import ast
+import operator
+import re
+from collections import namedtuple
+from decimal import Decimal, DecimalException, ROUND_HALF_UP
+import database
+from money import Money
+
+# Salary fields a rule can fill in, in salaries column order
+COMPONENTS = ("da", "hra", "ma", "pf", "insurance")
+
+# Names a rule can't define: the input and the amounts computed elsewhere
+RESERVED = {"basic", "tax", "net_salary", "min", "max", "abs", "round"}
+
+MAX_FORMULA_LENGTH = 500
+
+# Basic salary every resolved rule set is tried with before a change is saved
+SAMPLE_BASIC = Money.parse("50000")
+
+Rule = namedtuple("Rule", "id component formula department designation version")
+
+_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+_UNARY = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+def _round(value, digits=Decimal(0)):
+    return value.quantize(Decimal(1).scaleb(-int(digits)), rounding=ROUND_HALF_UP)
+
+
+_FUNCTIONS = {
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "round": _round,
+}
+
+
+class Formula:
+    """A rule's formula, compiled into a callable over a dict of Decimals."""
+
+    def __init__(self, text):
+        text = (text or "").strip()
+        if not text:
+            raise ValueError("Formula is empty")
+        if len(text) > MAX_FORMULA_LENGTH:
+            raise ValueError(f"Formula is longer than {MAX_FORMULA_LENGTH} characters")
+        try:
+            tree = ast.parse(text, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid formula '{text}': {e.msg}") from None
+        self.text = text
+        self.names = set()
+        self._func = self._compile(tree.body)
+
+    def __call__(self, values):
+        return self._func(values)
+
+    def _compile(self, node):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Only numbers are allowed in formulas, not {node.value!r}")
+            value = Decimal(str(node.value))
+            if not value.is_finite():
+                raise ValueError("Numbers in formulas should be finite, this one is too large")
+            return lambda values: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name in _FUNCTIONS:
+                raise ValueError(f"{name} should be called, as in {name}(...)")
+            self.names.add(name)
+            return lambda values: values[name]
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            op = _BINARY[type(node.op)]
+            left, right = self._compile(node.left), self._compile(node.right)
+            return lambda values: op(left(values), right(values))
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            op = _UNARY[type(node.op)]
+            operand = self._compile(node.operand)
+            return lambda values: op(operand(values))
+
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            operands = [self._compile(operand) for operand in [node.left] + node.comparators]
+            ops = [_COMPARE[type(op)] for op in node.ops]
+
+            def compare(values):
+                results = [operand(values) for operand in operands]
+                return all(op(a, b) for op, a, b in zip(ops, results, results[1:]))
+            return compare
+
+        if isinstance(node, ast.BoolOp):
+            operands = [self._compile(value) for value in node.values]
+            if isinstance(node.op, ast.And):
+                return lambda values: all(operand(values) for operand in operands)
+            return lambda values: any(operand(values) for operand in operands)
+
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = (self._compile(part) for part in (node.test, node.body, node.orelse))
+            return lambda values: body(values) if test(values) else orelse(values)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                and node.func.id in _FUNCTIONS and not node.keywords:
+            func = _FUNCTIONS[node.func.id]
+            if not node.args or (func is abs and len(node.args) != 1) \
+                    or (func is _round and len(node.args) > 2):
+                raise ValueError(f"Wrong number of arguments to {node.func.id}")
+            args = [self._compile(arg) for arg in node.args]
+            if func in (min, max) and len(args) == 1:
+                raise ValueError(f"{node.func.id} needs at least two arguments")
+            return lambda values: func(*(arg(values) for arg in args))
+
+        raise ValueError(f"'{ast.unparse(node)}' is not allowed in formulas")
+
+
+# Compiled formulas keyed by their text, which is the same in every database
+_compiled = {}
+
+
+def compiled(rule):
+    """The compiled formula of a rule, compiling it on first use."""
+    formula = _compiled.get(rule.formula)
+    if formula is None:
+        formula = _compiled[rule.formula] = Formula(rule.formula)
+    return formula
+
+
+class RuleSet:
+    """All rules of one rule version, resolved per department and designation.
+
+    For each name the most specific matching rule wins: department and
+    designation, then designation, then department, then the rule for
+    everybody. The evaluation order of each department/designation pair
+    is worked out once and cached.
+    """
+
+    def __init__(self, rules, version=None):
+        self.rules = list(rules)
+        self.version = version
+        self._plans = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def plan(self, department=None, designation=None):
+        """The (name, formula) pairs that apply, in dependency order."""
+        key = (department or "", designation or "")
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._resolve(*key)
+        return plan
+
+    def check(self, department="", designation=""):
+        """Resolve and try out every department/designation combination a scope covers.
+
+        Departments and designations without rules of their own all resolve
+        like '', so the combinations come from the rules themselves. Each
+        combination is evaluated for SAMPLE_BASIC. Raises ValueError naming
+        the first combination with an unknown name, a cycle or a rule that
+        fails.
+        """
+        departments = sorted({rule.department for rule in self.rules} | {""})
+        designations = sorted({rule.designation for rule in self.rules} | {""})
+        for each_department in departments:
+            if department and each_department != department:
+                continue
+            for each_designation in designations:
+                if designation and each_designation != designation:
+                    continue
+                try:
+                    self._evaluate(self.plan(each_department, each_designation), SAMPLE_BASIC)
+                except ValueError as e:
+                    scope = " / ".join(part for part in (each_department, each_designation) if part)
+                    raise ValueError(f"{e} (for {scope or 'everybody'})") from None
+
+    def _resolve(self, department, designation):
+        chosen = {}
+        for rule in self.rules:
+            if rule.department not in ("", department) or rule.designation not in ("", designation):
+                continue
+            rank = (rule.designation != "") * 2 + (rule.department != "")
+            if rule.component not in chosen or rank > chosen[rule.component][0]:
+                chosen[rule.component] = (rank, rule)
+
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Salary rules refer to each other: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            rule = chosen[name][1]
+            formula = compiled(rule)
+            for used in sorted(formula.names):
+                if used == "basic":
+                    continue
+                if used not in chosen:
+                    raise ValueError(f"Unknown name '{used}' in the {name} rule")
+                visit(used, path + [name])
+            state[name] = "done"
+            order.append((name, formula))
+
+        for name in sorted(chosen):
+            visit(name, [])
+        return order
+
+    def components(self, basic, department=None, designation=None):
+        """Amounts the rules give for an employee, as {component: Money}.
+
+        Components without a rule are left out, so the caller keeps its
+        own value for them.
+        """
+        plan = self.plan(department, designation)
+        if not plan:
+            return {}
+        amounts = self._evaluate(plan, basic)
+        for name, formula in plan:
+            if name in amounts and amounts[name].cents < 0:
+                raise ValueError(f"The {name} rule '{formula.text}' gave a negative amount")
+        return amounts
+
+    @staticmethod
+    def _evaluate(plan, basic):
+        values = {"basic": Money.parse(basic).to_decimal()}
+        amounts = {}
+        for name, formula in plan:
+            try:
+                value = formula(values)
+                if name in COMPONENTS:
+                    amounts[name] = Money.parse(value)
+                    # Later formulas see the amount actually paid
+                    value = amounts[name].to_decimal()
+            except (DecimalException, KeyError, ValueError) as e:
+                raise ValueError(f"The {name} rule '{formula.text}' failed: {e!r}") from None
+            values[name] = value
+        return amounts
+
+
+# Statements on the rules tables (query_plans.py checks them too)
+RULES_QUERY = "SELECT id, component, formula, department, designation, version FROM salary_rules"
+LIST_RULES_QUERY = RULES_QUERY + " ORDER BY component, department, designation"
+RULE_VERSION_QUERY = "SELECT version FROM salary_rules_version"
+SAVE_RULE = """
+    INSERT INTO salary_rules (component, formula, department, designation)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (component, department, designation) DO UPDATE SET
+        formula = excluded.formula, version = version + 1
+"""
+RULE_SCOPE_QUERY = "SELECT department, designation FROM salary_rules WHERE id=?"
+DELETE_RULE = "DELETE FROM salary_rules WHERE id=?"
+
+_rules = None
+
+
+def _fetch_rules(conn):
+    return [Rule(*row) for row in conn.execute(RULES_QUERY)]
+
+
+def get_rules():
+    """The current rules, reloaded only when the rule version has changed."""
+    global _rules
+    with database.connection() as conn:
+        version = (database.DB_PATH, conn.execute(RULE_VERSION_QUERY).fetchone()[0])
+        if _rules is None or _rules.version != version:
+            rules = _fetch_rules(conn)
+            # Drop compiled formulas no rule uses any more
+            current = {rule.formula for rule in rules}
+            for key in list(_compiled):
+                if key not in current:
+                    del _compiled[key]
+            _rules = RuleSet(rules, version)
+    return _rules
+
+
+def list_rules():
+    with database.connection() as conn:
+        return [Rule(*row) for row in conn.execute(LIST_RULES_QUERY)]
+
+
+def save_rule(component, formula, department="", designation=""):
+    """Add a rule, or replace the formula of the rule with the same scope."""
+    component = (component or "").strip().lower()
+    if not _NAME.match(component) or component in RESERVED:
+        raise ValueError(f"'{component}' can't be used as a rule name")
+    formula = Formula(formula)
+    with database.connection() as conn:
+        try:
+            conn.execute(SAVE_RULE, (component, formula.text, department or "", designation or ""))
+            # Only keep the rule if every combination it takes part in still works
+            RuleSet(_fetch_rules(conn)).check(department or "", designation or "")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def delete_rule(rule_id):
+    """Delete a rule, unless rules it applies alongside still use its name."""
+    with database.connection() as conn:
+        try:
+            rule = conn.execute(RULE_SCOPE_QUERY, (rule_id,)).fetchone()
+            if rule is None:
+                return 0
+            deleted = conn.execute(DELETE_RULE, (rule_id,)).rowcount
+            RuleSet(_fetch_rules(conn)).check(*rule)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return deleted
@@ -0,0 +1,191 @@
+"""
+Progressive income tax for the Payroll Management System
+"""
+
+import bisect
+import json
+import os
+import time
+from decimal import Decimal
+from money import Money
+import salary_kernel
+
+try:
+    import numpy as np
+except ImportError:
+    # Pure-Python fallback keeps the application usable without NumPy
+    np = None
+
+# Annual slabs as (lower bound of taxable income, rate). Each rate applies to
+# the part of the income between its bound and the next one.
+DEFAULT_SLABS = (
+    (0, "0"),
+    (300000, "0.05"),
+    (700000, "0.10"),
+    (1000000, "0.15"),
+    (1200000, "0.20"),
+    (1500000, "0.30"),
+)
+
+# Deducted from annual income before the slabs apply
+DEFAULT_STANDARD_DEDUCTION = 75000
+
+# Surcharge on the tax itself (health and education cess)
+DEFAULT_CESS = "0.04"
+
+PERIODS_PER_YEAR = 12
+
+# A JSON file like {"slabs": [[0, "0"], [300000, "0.05"], ...],
+# "standard_deduction": 75000, "cess": "0.04"} replaces the defaults
+SLABS_FILE = os.environ.get("PAYROLL_TAX_SLABS")
+
+# Rates are held as integer parts per million so all arithmetic is exact
+PPM = 1000000
+
+
+def _ppm(rate):
+    return int(Decimal(str(rate)) * PPM)
+
+
+def _round_div(value, divisor):
+    # Half-up division for non-negative integers
+    return (value + divisor // 2) // divisor
+
+
+class TaxTable:
+    """A progressive slab table precomputed for fast lookups.
+
+    The slab bounds are kept as a sorted array in minor units, next to the
+    rate of each slab and the tax accumulated below it, so the tax on any
+    income is one bisect plus one multiply. Batches use the same arrays
+    with a vectorized search.
+    """
+
+    def __init__(self, slabs=DEFAULT_SLABS, standard_deduction=DEFAULT_STANDARD_DEDUCTION,
+                 cess=DEFAULT_CESS, periods=PERIODS_PER_YEAR):
+        slabs = sorted((Money.parse(lower).cents, _ppm(rate)) for lower, rate in slabs)
+        if not slabs or slabs[0][0] != 0:
+            raise ValueError("The first tax slab should start at 0")
+        if any(not 0 <= rate <= PPM for lower, rate in slabs):
+            raise ValueError("Tax rates should be between 0 and 1")
+        if len({lower for lower, rate in slabs}) != len(slabs):
+            raise ValueError("Tax slabs should have different lower bounds")
+
+        self.slabs = [(Money(lower), Decimal(rate) / PPM) for lower, rate in slabs]
+        self.standard_deduction = Money.parse(standard_deduction).cents
+        self.cess = _ppm(cess)
+        self.periods = periods
+        self.lowers = [lower for lower, rate in slabs]
+        self.rates = [rate for lower, rate in slabs]
+        # Tax owed at each lower bound, in minor units times PPM
+        self.base = [0]
+        for (lower, rate), upper in zip(slabs, self.lowers[1:]):
+            self.base.append(self.base[-1] + (upper - lower) * rate)
+        if np is not None:
+            self._lowers = np.array(self.lowers, dtype=np.int64)
+            self._rates = np.array(self.rates, dtype=np.int64)
+            self._base = np.array(self.base, dtype=np.int64)
+
+    def annual_tax_cents(self, income):
+        """Tax in minor units on an annual income in minor units."""
+        taxable = max(0, income - self.standard_deduction)
+        i = bisect.bisect_right(self.lowers, taxable) - 1
+        tax = _round_div(self.base[i] + (taxable - self.lowers[i]) * self.rates[i], PPM)
+        return _round_div(tax * (PPM + self.cess), PPM)
+
+    def annual_tax(self, income):
+        """Tax on an annual taxable income."""
+        return Money(self.annual_tax_cents(Money.parse(income).cents))
+
+    def monthly_tax(self, taxable):
+        """Tax for one pay period, from that period's taxable income.
+
+        The income is annualized, taxed on the annual slabs and the tax
+        spread evenly over the periods of the year.
+        """
+        annual = self.annual_tax_cents(Money.parse(taxable).cents * self.periods)
+        return Money(_round_div(annual, self.periods))
+
+    def monthly_tax_batch(self, taxable):
+        """Tax for one pay period for a whole column of taxable incomes.
+
+        Takes any column salary_kernel.as_minor_units accepts and returns
+        minor units (a NumPy int64 array when NumPy is installed, otherwise
+        a MinorUnits list).
+        """
+        if np is None:
+            return salary_kernel.MinorUnits(
+                _round_div(self.annual_tax_cents(income * self.periods), self.periods)
+                for income in salary_kernel.as_minor_units(taxable))
+        income = salary_kernel.as_minor_units(taxable) * self.periods - self.standard_deduction
+        income = np.maximum(income, 0)
+        i = np.searchsorted(self._lowers, income, side="right") - 1
+        tax = (self._base[i] + (income - self._lowers[i]) * self._rates[i] + PPM // 2) // PPM
+        tax = (tax * (PPM + self.cess) + PPM // 2) // PPM
+        return (tax + self.periods // 2) // self.periods
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as file:
+            config = json.load(file)
+        return cls(config["slabs"],
+                   config.get("standard_deduction", DEFAULT_STANDARD_DEDUCTION),
+                   config.get("cess", DEFAULT_CESS),
+                   config.get("periods", PERIODS_PER_YEAR))
+
+
+_table = None
+
+
+def get_table():
+    """The tax table in use: PAYROLL_TAX_SLABS if set, else the defaults."""
+    global _table
+    if _table is None:
+        _table = TaxTable.from_file(SLABS_FILE) if SLABS_FILE else TaxTable()
+    return _table
+
+
+def set_table(table):
+    """Use a different tax table from now on (None goes back to the default)."""
+    global _table
+    _table = table
+
+
+def taxable_income(basic, da, hra, ma, pf, insurance):
+    """Taxable income of a pay period: earnings less PF and insurance.
+
+    Works on single amounts (returns Money) or on columns (returns minor
+    units, like salary_kernel).
+    """
+    if isinstance(basic, (list, tuple)) or (np is not None and isinstance(basic, np.ndarray)):
+        columns = [salary_kernel.as_minor_units(column) for column in (basic, da, hra, ma, pf, insurance)]
+        if np is not None:
+            return np.maximum(columns[0] + columns[1] + columns[2] + columns[3] - columns[4] - columns[5], 0)
+        return salary_kernel.MinorUnits(max(0, b + d + h + m - p - i) for b, d, h, m, p, i in zip(*columns))
+    amount = (Money.parse(basic) + Money.parse(da) + Money.parse(hra) + Money.parse(ma)
+              - Money.parse(pf) - Money.parse(insurance))
+    return amount if amount.cents > 0 else Money(0)
+
+
+def monthly_tax(basic, da, hra, ma, pf, insurance):
+    """Tax for one salary record from its other components."""
+    return get_table().monthly_tax(taxable_income(basic, da, hra, ma, pf, insurance))
+
+
+def benchmark(count=100000):
+    """Time the batch tax of ``count`` random incomes; returns milliseconds."""
+    import random
+    rng = random.Random(1)
+    incomes = [rng.randrange(1000000, 50000000) for _ in range(count)]
+    table = get_table()
+    started = time.perf_counter()
+    batch = table.monthly_tax_batch(salary_kernel.minor_units(incomes))
+    batch_ms = (time.perf_counter() - started) * 1000
+    # The batch must agree with the one-at-a-time lookup
+    assert all(int(tax) == table.monthly_tax(Money(income)).cents
+               for income, tax in zip(incomes[:1000], batch[:1000]))
+    return {"count": count, "batch_ms": round(batch_ms, 2)}
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,57 @@
+"""
+Field validation rules for the Payroll Management System
+"""
+
+import calendar
+import re
+from datetime import datetime
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+PHONE_PATTERN = re.compile(r'^\d{10,15}$')
+
+
+def validate_employee(employee):
+    """Return the first problem with an employee record, or None if it is valid.
+
+    ``employee`` maps the employee form fields (emp_id, name, email, phone,
+    doj, ...) to their text. Shared by the employee form and the importer.
+    """
+    # Validate Employee ID
+    if not employee.get("emp_id"):
+        return "Employee ID is required"
+
+    # Validate Name
+    if not employee.get("name"):
+        return "Name is required"
+
+    # Validate Email
+    email = employee.get("email")
+    if email and not EMAIL_PATTERN.match(email):
+        return "Invalid email format"
+
+    # Validate Phone
+    phone = employee.get("phone")
+    if phone and not PHONE_PATTERN.match(phone):
+        return "Phone number should be 10-15 digits"
+
+    # Validate Date of Joining
+    doj = employee.get("doj")
+    if doj:
+        try:
+            datetime.strptime(doj, '%Y-%m-%d')
+        except ValueError:
+            return "Date of Joining should be in YYYY-MM-DD format"
+
+    return None
+
+
+def period_bounds(period):
+    """Return (first day, first day of next month, last day) for 'YYYY-MM'."""
+    if not re.match(r'^\d{4}-\d{2}$', period or ""):
+        raise ValueError("Pay period should be in YYYY-MM format")
+    year, month = int(period[:4]), int(period[5:])
+    if not 1 <= month <= 12:
+        raise ValueError("Pay period should be in YYYY-MM format")
+    last_day = calendar.monthrange(year, month)[1]
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return (f"{period}-01", f"{next_year:04d}-{next_month:02d}-01", f"{period}-{last_day:02d}")
@@ -0,0 +1,285 @@
+import tkinter as tk
+from tkinter import ttk
+import styles
+
+
+class ListSource:
+    """Row source over rows already in memory, such as search results."""
+
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def count(self):
+        return len(self._rows)
+
+    def rows(self, offset, limit):
+        return self._rows[offset:offset + limit]
+
+    def row_inserted(self, row):
+        self._rows.append(tuple(row))
+
+    def row_updated(self, row):
+        for i, existing in enumerate(self._rows):
+            if existing[0] == row[0]:
+                self._rows[i] = tuple(row)
+
+    def row_deleted(self, key):
+        self._rows = [row for row in self._rows if row[0] != key]
+
+    def invalidate(self, from_key=None):
+        pass
+
+
+class VirtualTable(ttk.Frame):
+    """A table that only materializes the rows currently in view.
+
+    The Treeview holds one item per visible line. Scrolling re-fills those
+    items with rows fetched on demand from ``source`` (anything with
+    count() and rows(offset, limit)), keeping ``buffer`` rows either side
+    cached, so memory and redraw cost depend on the window height rather
+    than the number of records. The first value of each row is its key.
+
+    With a ``loader`` (DatabaseWorker.submit or anything with its
+    signature), rows outside the cache are read off the Tk thread: the
+    table keeps showing what it has and redraws when they arrive. One read
+    is in flight at a time, and a read made before the source or its rows
+    changed is dropped and made again.
+    """
+
+    def __init__(self, parent, columns, source=None, buffer=100, loader=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.source = source or ListSource([])
+        self.buffer = buffer
+        self.loader = loader
+        self.top = 0
+        self.total = 0
+        self.visible = 20
+        self.selected_key = None
+        self._cache_start = 0
+        self._cache_end = 0
+        self._cache = []
+        self._shown = []
+        self._select_at = None
+        self._loading = False
+        self._generation = 0
+
+        # Scrollbars - the vertical one scrolls the virtual rows, not the tree
+        self.scroll_y = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        scroll_x = ttk.Scrollbar(self, orient=tk.HORIZONTAL)
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=[name for name, heading, width in columns],
+            xscrollcommand=scroll_x.set,
+            selectmode="browse"
+        )
+        scroll_x.config(command=self.tree.xview)
+
+        self.scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Set headings and column widths
+        for name, heading, width in columns:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width)
+
+        self.tree['show'] = 'headings'
+        self.tree.pack(fill="both", expand=True)
+
+        # Keep the number of items in step with the window height
+        self.tree.bind("<Configure>", self._on_resize)
+
+        # Mouse wheel (Windows/macOS and X11) and keyboard navigation
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll(3))
+        self.tree.bind("<Up>", lambda event: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self._move_selection(-self.visible))
+        self.tree.bind("<Next>", lambda event: self._move_selection(self.visible))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+    def bind_rows(self, sequence, func):
+        """Bind an event on the rows, e.g. a click that loads the selection."""
+        self.tree.bind(sequence, func, add="+")
+
+    def set_source(self, source):
+        """Show a different row source, starting from the top."""
+        self.source = source
+        self.top = 0
+        self.selected_key = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the row count and visible rows, keeping the scroll position."""
+        self.total = self.source.count()
+        self.top = max(0, min(self.top, self.total - self.visible))
+        self._clear_cache()
+        self._redraw()
+
+    def insert_row(self, values):
+        """Show a newly added row without reloading the table."""
+        self.source.row_inserted(values)
+        self._reload_window()
+
+    def update_row(self, values):
+        """Patch the row with the same key in place; nothing is re-read."""
+        self.source.row_updated(values)
+        key = values[0]
+        for i, row in enumerate(self._cache):
+            if row[0] == key:
+                self._cache[i] = tuple(values)
+        for i, row in enumerate(self._shown):
+            if row[0] == key:
+                self._shown[i] = tuple(values)
+                self.tree.item(f"row{i}", values=values)
+
+    def remove_rows(self, keys):
+        """Drop deleted rows without reloading the table."""
+        for key in keys:
+            self.source.row_deleted(key)
+        if self.selected_key in keys:
+            self.selected_key = None
+        self._reload_window()
+
+    def _reload_window(self):
+        # Rows around the view shift, so re-read just the window (the count
+        # was adjusted by the source and needs no query)
+        self.total = self.source.count()
+        self.top = max(0, min(self.top, self.total - self.visible))
+        self._clear_cache()
+        self._redraw()
+
+    def _clear_cache(self):
+        self._cache = []
+        self._cache_start = self._cache_end = 0
+        # A read still in flight was made before the change
+        self._generation += 1
+
+    def selected_row(self):
+        """Return the values of the selected row, or None."""
+        item = self.tree.focus()
+        if not item or not self.tree.selection():
+            return None
+        index = self.tree.index(item)
+        return self._shown[index] if index < len(self._shown) else None
+
+    def yview(self, *args):
+        """Scrollbar callback: 'moveto fraction' or 'scroll n units|pages'."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.top += step * (self.visible if args[2] == "pages" else 1)
+        self.top = max(0, min(self.top, self.total - self.visible))
+        self._redraw()
+
+    def _scroll(self, rows):
+        self.yview("scroll", rows, "units")
+        return "break"
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll(-3 * delta)
+
+    def _on_resize(self, event):
+        # One heading plus as many whole rows as fit
+        visible = max(1, event.height // styles.TABLE_ROW_HEIGHT - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = max(0, min(self.top, self.total - self.visible))
+            self._redraw()
+
+    def _on_select(self, event=None):
+        # Clearing the selection while scrolling must not forget the key
+        row = self.selected_row()
+        if row:
+            self.selected_key = row[0]
+
+    def _move_selection(self, delta):
+        """Move the selection, scrolling when it would leave the window."""
+        if not self.total:
+            return "break"
+        item = self.tree.focus()
+        current = self.top + self.tree.index(item) if item else self.top - 1
+        target = max(0, min(current + delta, self.total - 1))
+        if target < self.top:
+            self.top = target
+        elif target >= self.top + self.visible:
+            self.top = target - self.visible + 1
+        # The key is taken from the row once it is drawn
+        self._select_at = target
+        self._redraw()
+        return "break"
+
+    def _rows(self, start, count):
+        """Rows [start, start + count), or None while a loader is reading them."""
+        end = min(start + count, self.total)
+        if not (self._cache_start <= start and end <= self._cache_end):
+            first, limit = max(0, start - self.buffer), count + 2 * self.buffer
+            if self.loader is not None:
+                self._load(first, limit)
+                return None
+            self._cache = list(self.source.rows(first, limit))
+            self._cache_start, self._cache_end = first, first + limit
+        return self._cache[start - self._cache_start:end - self._cache_start]
+
+    def _load(self, first, limit):
+        if self._loading:
+            # The redraw after the current read asks again for what is in view then
+            return
+        self._loading = True
+        source, generation = self.source, self._generation
+
+        def loaded(rows):
+            self._loading = False
+            if generation == self._generation:
+                self._cache = list(rows)
+                self._cache_start, self._cache_end = first, first + limit
+            self._redraw()
+
+        def failed(error):
+            self._loading = False
+            raise error
+
+        # Page reads are short and the table waits on them, so they can't be cancelled
+        self.loader(source.rows, first, limit, on_done=loaded, on_error=failed, cancellable=False)
+
+    def _redraw(self):
+        rows = self._rows(self.top, self.visible)
+        if rows is None:
+            return
+        self._shown = rows
+        if self._select_at is not None:
+            if 0 <= self._select_at - self.top < len(rows):
+                self.selected_key = rows[self._select_at - self.top][0]
+            self._select_at = None
+        items = self.tree.get_children()
+
+        # Add or remove items so there is exactly one per visible row
+        for item in items[len(rows):]:
+            self.tree.delete(item)
+        for i in range(len(items), len(rows)):
+            self.tree.insert("", "end", iid=f"row{i}")
+
+        selected = None
+        for i, row in enumerate(rows):
+            self.tree.item(f"row{i}", values=row)
+            if self.selected_key is not None and row[0] == self.selected_key:
+                selected = f"row{i}"
+        if selected:
+            self.tree.selection_set(selected)
+            self.tree.focus(selected)
+        else:
+            self.tree.selection_set(())
+
+        # Position the scrollbar thumb over the visible slice
+        if self.total:
+            self.scroll_y.set(self.top / self.total,
+                              min(1.0, (self.top + len(rows)) / self.total))
+        else:
+            self.scroll_y.set(0.0, 1.0)
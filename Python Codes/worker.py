@@ -0,0 +1,184 @@
+"""
+Background database worker for the Payroll Management System
+"""
+
+import queue
+import sys
+import threading
+import time
+import profiling
+
+# How often the Tk main loop checks for finished jobs (milliseconds)
+POLL_INTERVAL = 15
+
+# Longest the main loop may be kept from handling events before we warn (seconds)
+LATENCY_TARGET = 0.1
+
+
+class Job:
+    """A unit of work submitted to the worker.
+
+    Cancelling a job that has not started yet skips it. A job that is
+    already running is not interrupted: it runs to the end and its result
+    (or error) is discarded instead of being passed to its callbacks.
+    """
+
+    def __init__(self, func, args, kwargs, on_done, on_error, cancellable):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancellable = cancellable
+        self.cancelled = False
+        # Timed under the action that submitted it (see profiling)
+        self.label = profiling.current() or getattr(func, "__name__", "job")
+        self.submitted = time.perf_counter()
+        self.finished = None
+
+    def cancel(self):
+        if self.cancellable:
+            self.cancelled = True
+
+
+class DatabaseWorker:
+    """Runs database work on background threads so the Tk main loop never blocks.
+
+    Jobs are executed by a small set of daemon threads. Their results are
+    put on a thread-safe queue which the main loop drains every
+    POLL_INTERVAL ms with root.after while jobs are pending, so
+    on_done/on_error callbacks always run on the Tk thread and may touch
+    widgets. The poll also measures how late it runs, which is the delay
+    any user event would have seen while jobs were running.
+    """
+
+    def __init__(self, root, threads=2, poll_interval=POLL_INTERVAL):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.indicator = None
+        self.max_latency = 0.0
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._jobs = []
+        self._stopped = False
+        self._spinning = False
+        self._polling = False
+
+        self._threads = [threading.Thread(target=self._run, name=f"db-worker-{i}", daemon=True)
+                         for i in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func, *args, on_done=None, on_error=None, cancellable=True, **kwargs):
+        """Queue func(*args, **kwargs) and return its Job.
+
+        on_done(result) or on_error(exception) is called on the Tk thread
+        when the job finishes, unless it was cancelled. Writes should pass
+        cancellable=False so their UI follow-up always happens.
+        """
+        job = Job(func, args, kwargs, on_done, on_error, cancellable)
+        self._jobs.append(job)
+        self._tasks.put(job)
+        self._update_indicator()
+        self._schedule_poll()
+        return job
+
+    def cancel_all(self):
+        """Cancel every cancellable job that is queued or running."""
+        for job in self._jobs:
+            job.cancel()
+
+    def busy(self):
+        return bool(self._jobs)
+
+    def set_indicator(self, progressbar):
+        """Use an indeterminate ttk.Progressbar to show when jobs are running."""
+        self.indicator = progressbar
+        self._spinning = False
+        self._update_indicator()
+
+    def shutdown(self):
+        self._stopped = True
+        self.cancel_all()
+        for _ in self._threads:
+            self._tasks.put(None)
+
+    def _run(self):
+        while True:
+            job = self._tasks.get()
+            if job is None:
+                return
+            if job.cancelled:
+                self._results.put((job, None, None))
+                continue
+            try:
+                with profiling.operation(job.label, "job",
+                                         queued_ms=round((time.perf_counter() - job.submitted) * 1000, 1)):
+                    result = job.func(*job.args, **job.kwargs)
+                self._results.put((job, result, None))
+            except Exception as e:
+                self._results.put((job, None, e))
+
+    def _schedule_poll(self):
+        # Only poll while there are jobs to collect
+        if self._polling or self._stopped:
+            return
+        self._polling = True
+        self._next_poll = time.perf_counter() + self.poll_interval / 1000
+        self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        if self._stopped:
+            return
+
+        # How late this poll is shows how long user events were kept waiting
+        now = time.perf_counter()
+        latency = max(0.0, now - self._next_poll)
+        self.max_latency = max(self.max_latency, latency)
+        if latency > LATENCY_TARGET:
+            print(f"UI event latency {latency * 1000:.0f} ms exceeded the "
+                  f"{LATENCY_TARGET * 1000:.0f} ms target")
+
+        # Reschedule first, callbacks may open dialogs that run a nested loop
+        if self._jobs:
+            self._polling = True
+            self._next_poll = now + self.poll_interval / 1000
+            self.root.after(self.poll_interval, self._poll)
+
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            job.finished = time.perf_counter()
+            if job in self._jobs:
+                self._jobs.remove(job)
+            self._update_indicator()
+            if job.cancelled:
+                continue
+            try:
+                with profiling.operation(job.label, "done"):
+                    if error is None:
+                        if job.on_done:
+                            job.on_done(result)
+                    elif job.on_error:
+                        job.on_error(error)
+                    else:
+                        raise error
+            except Exception:
+                # Report like any other Tk callback error, then keep polling
+                self.root.report_callback_exception(*sys.exc_info())
+
+    def _update_indicator(self):
+        if self.indicator is None or self._spinning == bool(self._jobs):
+            return
+        try:
+            if self._jobs:
+                self.indicator.start(10)
+            else:
+                self.indicator.stop()
+            self._spinning = bool(self._jobs)
+        except Exception:
+            # The indicator was destroyed with the screen it belonged to
+            self.indicator = None